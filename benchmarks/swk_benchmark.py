@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+"""
+swk benchmark suite: hostlist expansion and CLI startup.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+
+Runs against a throwaway HOME with synthetic parser plugins, so your ~/.swk is never touched.
+Results are printed (or written to --output) as JSON, so runs can be compared with each other.
+
+Usage: python benchmarks/swk_benchmark.py [--sizes 1000,100000] [--latency 0.05] [--repeat 5] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+
+swk_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+bench_parsers_module = '''
+import time
+from swk import classes
+
+
+class BenchParser(classes.SWKParserPlugin):
+    """%<N> expands to hosts bench0..bench<N-1>, %<N>_<M> to hosts bench<M>..bench<N-1>"""
+    _parsers = {'%': {'help': 'synthetic hostgroup\\n'}}
+    _parsers_help_message = "%<hosts count>[_<first host>]\\n"
+
+    def parse(self):
+        time.sleep(float(getattr(self, '_latency', 0)))
+        count, _, first = self._hostgroup.partition('_')
+        return ['bench{0}'.format(i) for i in range(int(first or 0), int(count))]
+'''
+
+config_template = '''[Main]
+logfile = {home}/swk.log
+loglevel = error
+check_for_updates = no
+plugins_directories = {plugins_dir}
+cache_ttl = 0
+
+[BenchParser]
+latency = {latency}
+'''
+
+
+def prepare_home(latency):
+    home = tempfile.mkdtemp(prefix='swk-benchmark-')
+    swk_home = os.path.join(home, '.swk')
+    plugins_dir = os.path.join(home, 'plugins')
+    os.mkdir(swk_home)
+    os.mkdir(plugins_dir)
+    with open(os.path.join(plugins_dir, 'swk_bench_parsers.py'), 'w') as f:
+        f.write(bench_parsers_module)
+    with open(os.path.join(swk_home, 'swk.ini'), 'w') as f:
+        f.write(config_template.format(home=swk_home, plugins_dir=plugins_dir, latency=latency))
+    return home
+
+
+def measure(func, repeat):
+    timings = list()
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        timings.append(time.time() - start)
+    return {'min': min(timings), 'median': sorted(timings)[len(timings) // 2], 'max': max(timings),
+            'repeat': repeat}
+
+
+def bench_expand_hostlist(sizes, repeat):
+    from swk import swiss_knife
+
+    sys.argv = ['swk', 'dr', 'bench0']
+    swk_instance = swiss_knife.SwissKnife(cwd=os.getcwd(), swk_dir=os.path.join(swk_root, 'swk'),
+                                          swk_path=os.path.join(swk_root, 'swk', 'main.py'))
+
+    def expand(expression):
+        def _expand():
+            swk_instance._hostlist = expression
+            return swk_instance._expand_hostlist()
+        return _expand
+
+    results = dict()
+    for size in sizes:
+        expressions = {
+            'union': '%{0}'.format(size),
+            'union_overlapping': '%{0} %{0}_{1}'.format(size, size // 2),
+            'union_negation': '%{0} -%{1}_{2}'.format(size, size // 2, size // 4),
+            'union_intersection': '%{0} &%{1}_{2}'.format(size, size // 2, size // 4),
+            'four_parsers': '%{0} %{0}_1 -%{1} &%{0}_{1}'.format(size, size // 10),
+        }
+        for name, expression in expressions.items():
+            results['{0}/{1}'.format(name, size)] = dict(measure(expand(expression), repeat), expression=expression)
+    return results
+
+
+def bench_host_expressions(repeat):
+    import exrex
+    from swk import hostlist
+
+    # name: (expression, whether a regex means the same hosts, so that exrex timings are comparable)
+    expressions = {
+        'range_1k': ('web[0-9][0-9][0-9]', True),
+        'range_100k': ('web[00001-100000].dc1', False),
+        'range_alternatives': ('db{a,b,c,d}[1-8][001-999]', False),
+        'regex_alternation': (r'frontend([0-1][0-9]|2[0-5])\.dc([1-3])', True),
+    }
+    results = dict()
+    for name, (expression, same_as_regex) in expressions.items():
+        # the way swk expands it with host_ranges = yes
+        host_range = hostlist.HostRange.parse(expression, ranges=True)
+        results['uses_native_expander/' + name] = host_range is not None
+        if host_range is not None:
+            results['hosts/' + name] = host_range.count()
+            results['hostrange/' + name] = measure(lambda: list(host_range), repeat)
+        if same_as_regex or host_range is None:
+            results['exrex/' + name] = measure(
+                lambda: list(exrex.generate(expression.replace('.', r'\.'), limit=1000)), repeat)
+    return results
+
+
+def bench_cli_startup(home, repeat):
+    env = dict(os.environ, HOME=home, PYTHONPATH=swk_root)
+    cmd = [sys.executable, '-c', 'import sys; sys.argv = ["swk", "dr", "bench1"]; '
+                                 'from swk import main; main.main()']
+    devnull = open(os.devnull, 'w')
+    swk_home = os.path.join(home, '.swk')
+    cache_files = ('plugins_manifest.json', 'entry_points_cache.json')
+
+    def cold():
+        for cache_file in cache_files:
+            try:
+                os.remove(os.path.join(swk_home, cache_file))
+            except OSError:
+                pass
+        subprocess.check_call(cmd, env=env, stdout=devnull)
+
+    def warm():
+        subprocess.check_call(cmd, env=env, stdout=devnull)
+
+    results = {'python_startup': measure(lambda: subprocess.check_call([sys.executable, '-c', 'pass'], env=env),
+                                         repeat),
+               'cold': measure(cold, repeat)}
+    warm()  # make sure all the caches are there
+    results['warm'] = measure(warm, repeat)
+    devnull.close()
+    return results
+
+
+def main():
+    argparser = argparse.ArgumentParser(description="swk benchmark suite")
+    argparser.add_argument('--sizes', default='1000,10000,100000,1000000',
+                           help='comma-separated synthetic hostgroup sizes')
+    argparser.add_argument('--latency', type=float, default=0.0, help='artificial parser latency, seconds')
+    argparser.add_argument('--repeat', type=int, default=3, help='how many times each measurement is taken')
+    argparser.add_argument('--output', help='write JSON results to this file instead of stdout')
+    args = argparser.parse_args()
+
+    home = prepare_home(args.latency)
+    os.environ['HOME'] = home  # swk reads ~/.swk paths at import time
+    sys.path.insert(0, swk_root)
+    try:
+        from swk import version
+        results = {
+            'swk_version': version.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'parameters': {'sizes': args.sizes, 'latency': args.latency, 'repeat': args.repeat},
+            'expand_hostlist': bench_expand_hostlist([int(x) for x in args.sizes.split(',')], args.repeat),
+            'host_expressions': bench_host_expressions(args.repeat),
+            'cli_startup': bench_cli_startup(home, args.repeat),
+        }
+    finally:
+        shutil.rmtree(home, ignore_errors=True)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -36,7 +36,7 @@ setup(name='swk',
       install_requires=[
           'exrex>=0.9.4',
           'paramiko>=1.16.0',
-          'scp>=0.10.2',
+          'scp>=0.12.0',
           'pypsi>=1.3.0',
           'six>=1.10.0'
       ],
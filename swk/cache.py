@@ -0,0 +1,185 @@
+"""
+A module containing persistent cache used by swk to store parsers' results.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+import tempfile
+
+
+def config_digest(config, ignored_options=()):
+    """
+    :return: a digest of config dict items, to tell apart results of the same parser configured differently
+             without storing the config (which may contain credentials) in the cache
+    """
+    items = sorted((str(k), str(v)) for k, v in config.items() if k not in ignored_options)
+    return hashlib.sha1(json.dumps(items).encode('utf-8')).hexdigest()
+
+
+class SWKCache(object):
+    """
+    A persistent key-value cache living in swk cache directory.
+
+    Every entry is stored in its own file, so concurrent swk runs never rewrite each other's entries.
+    An entry's file mtime is bumped on every read, and when the cache grows bigger than max_size bytes,
+    the least recently used entries are evicted.
+    """
+    _cache_subdirectory = "cache"
+    _entry_suffix = ".json"
+
+    def __init__(self, cache_directory, max_size=10 * 1024 * 1024):
+        self._cache_directory = os.path.join(cache_directory, self._cache_subdirectory)
+        self._max_size = max_size
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+        if not os.path.isdir(self._cache_directory):
+            try:
+                os.mkdir(self._cache_directory)
+            except OSError:  # someone could have created it already
+                if not os.path.isdir(self._cache_directory):
+                    raise
+
+    def _entry_path(self, key):
+        key_digest = hashlib.sha1(json.dumps(list(key)).encode('utf-8')).hexdigest()
+        return os.path.join(self._cache_directory, key_digest + self._entry_suffix)
+
+    def _entries(self):
+        return [os.path.join(self._cache_directory, x) for x in os.listdir(self._cache_directory)
+                if x.endswith(self._entry_suffix)]
+
+    def get(self, key):
+        """
+        :return: a tuple (value, age in seconds), or (None, None) if there's no such entry.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+            os.utime(entry_path, None)
+        except (IOError, OSError, ValueError):
+            return None, None
+        return entry['value'], time.time() - entry['created']
+
+    def set(self, key, value):
+        entry_path = self._entry_path(key)
+        fd, temp_path = tempfile.mkstemp(dir=self._cache_directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'key': list(key), 'created': time.time(), 'value': value}, f)
+            os.rename(temp_path, entry_path)
+        except (IOError, OSError) as e:
+            logging.error("Couldn't write cache entry {0}: {1}".format(entry_path, str(e)))
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+            return
+        self._evict()
+
+    def _evict(self):
+        entries = list()
+        total_size = 0
+        for entry_path in self._entries():
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry_path))
+            total_size += entry_stat.st_size
+
+        for _, entry_size, entry_path in sorted(entries):
+            if total_size <= self._max_size:
+                break
+            try:
+                os.remove(entry_path)
+            except OSError:
+                pass
+            total_size -= entry_size
+            logging.debug("Evicted cache entry {0}".format(entry_path))
+
+    def get_or_refresh(self, key, refresh, ttl, stale_ttl=0):
+        """
+        Returns cached value for key, calling refresh() to get a new one when needed.
+
+        Entries younger than ttl seconds are returned as is. Entries that are older, but still younger
+        than ttl + stale_ttl, are returned as well, while refresh() is called in background to update them.
+        Otherwise, refresh() is called right away and its result is cached.
+        """
+        if ttl <= 0:
+            return refresh()
+
+        value, age = self.get(key)
+        if value is not None:
+            if age < ttl:
+                logging.debug("Cache hit for {0}".format(key))
+                return value
+            if age < ttl + stale_ttl:
+                logging.debug("Stale cache hit for {0}, refreshing in background".format(key))
+                self._refresh_in_background(key, refresh)
+                return value
+
+        logging.debug("Cache miss for {0}".format(key))
+        value = refresh()
+        self.set(key, value)
+        return value
+
+    def _refresh_in_background(self, key, refresh):
+        entry_path = self._entry_path(key)
+        with self._refreshing_lock:
+            if entry_path in self._refreshing:
+                return
+            self._refreshing.add(entry_path)
+
+        def _refresh():
+            try:
+                self.set(key, refresh())
+            except Exception as e:
+                logging.error("Couldn't refresh cache entry for {0}: {1}".format(key, str(e)))
+            finally:
+                with self._refreshing_lock:
+                    self._refreshing.discard(entry_path)
+
+        # a daemon thread: swk doesn't wait for the network before exiting, an unfinished refresh
+        # is simply done again by the next run
+        thread = threading.Thread(target=_refresh)
+        thread.daemon = True
+        thread.start()
+
+    def stats(self):
+        """
+        :return: a dict with entries count, their total size in bytes and the oldest entry age in seconds.
+        """
+        now = time.time()
+        result = {'entries': 0, 'size': 0, 'oldest_access': 0}
+        for entry_path in self._entries():
+            try:
+                entry_stat = os.stat(entry_path)
+            except OSError:
+                continue
+            result['entries'] += 1
+            result['size'] += entry_stat.st_size
+            result['oldest_access'] = max(result['oldest_access'], int(now - entry_stat.st_mtime))
+        return result
+
+    def purge(self):
+        """
+        :return: number of entries removed.
+        """
+        removed = 0
+        for entry_path in self._entries():
+            try:
+                os.remove(entry_path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -17,7 +17,9 @@ from __future__ import print_function
 import re
 import platform
 import os
-import pkg_resources
+import sys
+import json
+import socket
 if platform.python_version().startswith('2'):
     import xmlrpclib
     import urllib2
@@ -119,6 +121,8 @@ def get_highest_version(versions):
     @returns: string of a PyPI package version
 
     """
+    import pkg_resources  # it's slow to import, and we need it only once in a while
+
     sorted_versions = []
     for ver in versions:
         sorted_versions.append((pkg_resources.parse_version(ver), ver))
@@ -126,3 +130,41 @@ def get_highest_version(versions):
     sorted_versions = list(reversed(sorted(sorted_versions)))
     return sorted_versions[0][1]
 
+
+def write_updates_report(package_version_dict, report_path, timeout=30):
+    """Check PyPI for newer versions of packages and write the findings to report_path.
+
+    Meant to be run in a detached process, so the report is read and printed
+    by the next swk invocation.
+
+    @param package_version_dict: installed versions, {package_name: version}
+    @type package_version_dict: dict
+
+    """
+    socket.setdefaulttimeout(timeout)
+    report = {'errors': [], 'notices': []}
+    try:
+        cheese_shop = CheeseShop()
+    except Exception:
+        report['errors'].append(None)
+        cheese_shop = None
+
+    if cheese_shop is not None:
+        for package_name, installed_version in package_version_dict.items():
+            try:
+                last_version = cheese_shop.package_releases(package_name)[0]
+            except Exception:
+                report['errors'].append(package_name)
+                continue
+            if get_highest_version([installed_version, last_version]) != installed_version:
+                report['notices'].append({'package': package_name, 'installed': installed_version,
+                                          'latest': last_version})
+
+    temp_report_path = report_path + '.tmp'
+    with open(temp_report_path, 'w') as f:
+        json.dump(report, f)
+    os.rename(temp_report_path, report_path)
+
+
+if __name__ == '__main__':
+    write_updates_report(json.loads(sys.argv[2]), sys.argv[1])
@@ -42,6 +42,8 @@ class SWKCommandPlugin(SWKPlugin):
      }
     where "requires_hostlist" is whether command works with hosts
     "help" is a help message which is shown in shell mode when user issues 'help <command_name>' command.
+    optional "streams_hostlist": True means the command is able to take hostlist as an iterator, so when
+    hosts are read from stdin, command starts working on them as soon as they arrive.
 
     _commands_help_message is a class attr, a str
     which should contain plugin's name and a brief description of all the commands included
@@ -64,8 +66,11 @@ class SWKCommandPlugin(SWKPlugin):
 
         Additional object attributes will be passed when constructing the object:
           self._command contains the string with command invoked
-          self._hostlist contains the expanded hostlist if it's required by the command
+          self._hostlist contains the expanded hostlist if it's required by the command (an iterator of hosts
+            for commands that stream hostlist, if hosts are read from stdin)
           self._command_args contains the remainder of command line
+          self._output contains output mode given by --output option, if any. It's up to the plugin which modes
+            it supports
 
         everything mentioned in config file will also be available as self._key = value
         the config file section MUST be named the same as your plugin class
@@ -95,6 +100,10 @@ class SWKCommandPlugin(SWKPlugin):
     def requires_hostlist(cls, command):
         return cls._commands.get(command).get('requires_hostlist', True)
 
+    @classmethod
+    def streams_hostlist(cls, command):
+        return cls._commands.get(command).get('streams_hostlist', False)
+
     @classmethod
     def commands_help(cls):
         return cls._commands_help_message
@@ -107,6 +116,8 @@ class SWKCommandPlugin(SWKPlugin):
 
         You should redefine it.
         Here you should determine which command is called and process it.
+        Print the results with swk.output.write (whole lines only), so that they're written in one place
+        with everything else, including output of worker processes and threads.
         """
 
 
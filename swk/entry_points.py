@@ -0,0 +1,98 @@
+"""
+A module containing fast, cached discovery of installed swk plugins entry points.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:
+    try:
+        import importlib_metadata
+    except ImportError:
+        importlib_metadata = None  # old pythons, falling back to pkg_resources
+
+
+def scan_entry_points(group):
+    """
+    Scans installed distributions for entry points in group.
+
+    :return: a list of dicts with entry point name, its module, and distribution name and version it belongs to.
+    """
+    result = list()
+    seen = set()
+    if importlib_metadata is not None:
+        for distribution in importlib_metadata.distributions():
+            distribution_name = distribution.metadata['Name']
+            for entry_point in distribution.entry_points:
+                # a distribution found twice on sys.path counts once, the first one wins as it would on import
+                if entry_point.group != group or (distribution_name, entry_point.name) in seen:
+                    continue
+                seen.add((distribution_name, entry_point.name))
+                result.append({'name': entry_point.name, 'module': entry_point.value.split(':')[0].strip(),
+                               'distribution': distribution_name, 'version': distribution.version})
+    else:
+        import pkg_resources
+        for entry_point in pkg_resources.iter_entry_points(group=group, name=None):
+            result.append({'name': entry_point.name, 'module': entry_point.module_name,
+                           'distribution': entry_point.dist.project_name, 'version': entry_point.dist.version})
+    return result
+
+
+class SWKEntryPointsCache(object):
+    """
+    Entry points discovered by scan_entry_points, stored in swk cache directory.
+
+    Installing, upgrading or removing a package always changes the mtime of the directory it's installed to,
+    so the cache is valid as long as mtimes of everything on sys.path stay the same.
+    """
+    _cache_filename = "entry_points_cache.json"
+
+    def __init__(self, cache_directory):
+        self._cache_path = os.path.join(cache_directory, self._cache_filename)
+
+    @staticmethod
+    def _signature():
+        signature = {'python': sys.executable, 'paths': list()}
+        for path in sys.path:
+            if not path:  # current directory differs from one run to another
+                continue
+            try:
+                signature['paths'].append([path, os.stat(path).st_mtime])
+            except OSError:
+                continue
+        return signature
+
+    def entry_points(self, group):
+        signature = self._signature()
+        try:
+            with open(self._cache_path) as f:
+                cache = json.load(f)
+            if cache['signature'] == signature and group in cache['groups']:
+                return cache['groups'][group]
+        except (IOError, OSError, ValueError, KeyError):
+            cache = None
+
+        logging.debug("Entry points cache is stale, scanning installed distributions")
+        if cache is None or cache.get('signature') != signature:
+            cache = {'signature': signature, 'groups': dict()}
+        cache['groups'][group] = scan_entry_points(group)
+
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self._cache_path), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cache, f)
+            os.rename(temp_path, self._cache_path)
+        except (IOError, OSError) as e:
+            logging.error("Couldn't write entry points cache {0}: {1}".format(self._cache_path, str(e)))
+        return cache['groups'][group]
@@ -27,3 +27,8 @@ class ExpandingHostlistError(Exception):
 class ConfigNotFoundError(Exception):
     def __init__(self, message):
         super(ConfigNotFoundError, self).__init__(message)
+
+
+class PluginImportError(Exception):
+    def __init__(self, message):
+        super(PluginImportError, self).__init__(message)
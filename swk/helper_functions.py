@@ -8,7 +8,7 @@ Copyright (C) 2016  Pavel "trueneu" Gurkov
 see swk/main.py for more information on License and contacts
 """
 
-import sys
+from swk import output
 
 
 class Bcolors:
@@ -21,9 +21,27 @@ class Bcolors:
 
 
 class SWKHelperFunctions(object):
+    _secret_options = ('password', 'passphrase')
+
     def __init__(self):
         pass
 
+    @staticmethod
+    def loggable_config(config):
+        """
+        :return: a copy of config (or of a dict of config sections) safe to write to log: values of options
+                 such as password or identityfile_passphrase are masked
+        """
+        result = dict()
+        for k, v in config.items():
+            if isinstance(v, dict):
+                result[k] = SWKHelperFunctions.loggable_config(v)
+            elif any(secret in str(k) for secret in SWKHelperFunctions._secret_options):
+                result[k] = '***'
+            else:
+                result[k] = v
+        return result
+
     @staticmethod
     def print_line_with_host_prefix(line, host, is_err=False, colorful=True, print_prefix=True):
         parallel_line_prefix = '[%s]: '
@@ -35,12 +53,7 @@ class SWKHelperFunctions(object):
         if not data.endswith('\n'):
             data += '\n'
 
-        if is_err:
-            if colorful:
-                data = Bcolors.FAIL + data + Bcolors.ENDC
-            outstream = sys.stderr
-        else:
-            outstream = sys.stdout
+        if is_err and colorful:
+            data = Bcolors.FAIL + data + Bcolors.ENDC
 
-        outstream.write(data)
-        outstream.flush()
+        output.write(data, is_err=is_err)
@@ -0,0 +1,295 @@
+"""
+A module containing the hostlist data structure used when expanding host expressions.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import re
+import string
+from collections import OrderedDict
+from six.moves import range
+
+
+class HostList(object):
+    """
+    An insertion-ordered set of hostnames.
+
+    Every operation is linear in the size of its argument (or of the hostlist itself for intersection),
+    so expanding expressions like '^ALL -%decom' stays fast even for 100k+ hosts.
+    """
+
+    def __init__(self, hosts=None):
+        self._hosts = OrderedDict()
+        if hosts is not None:
+            self.update(hosts)
+
+    def add(self, host):
+        self._hosts[host] = None
+
+    def update(self, hosts):
+        """Union: adds hosts that aren't in the list yet, keeping the order they've been added in."""
+        for host in hosts:
+            self._hosts[host] = None
+
+    def difference_update(self, hosts):
+        """Difference: removes hosts from the list if present."""
+        for host in hosts:
+            self._hosts.pop(host, None)
+
+    def intersection_update(self, hosts):
+        """Intersection: leaves only hosts that are present in both lists."""
+        hosts = hosts if isinstance(hosts, (HostList, set, frozenset, dict)) else set(hosts)
+        self._hosts = OrderedDict((host, None) for host in self._hosts if host in hosts)
+
+    def __or__(self, other):
+        result = HostList(self)
+        result.update(other)
+        return result
+
+    def __sub__(self, other):
+        result = HostList(self)
+        result.difference_update(other)
+        return result
+
+    def __and__(self, other):
+        result = HostList(self)
+        result.intersection_update(other)
+        return result
+
+    def __contains__(self, host):
+        return host in self._hosts
+
+    def __iter__(self):
+        return iter(self._hosts)
+
+    def __len__(self):
+        return len(self._hosts)
+
+    def __repr__(self):
+        return "HostList({0})".format(list(self._hosts))
+
+    def sorted(self):
+        return sorted(self._hosts)
+
+
+class _NumericRange(object):
+    def __init__(self, start, end):
+        self._start = int(start)
+        self._end = int(end)
+        if self._start > self._end:
+            raise ValueError("Invalid range {0}-{1}".format(start, end))
+        # [001-500] is zero-padded up to the width of its start
+        self._width = len(start) if len(start) > 1 and start.startswith('0') else 0
+
+    def __iter__(self):
+        for number in range(self._start, self._end + 1):
+            yield str(number).zfill(self._width)
+
+    def __len__(self):
+        return self._end - self._start + 1
+
+
+class _Alternatives(object):
+    """A part of hostname that's one of several strings or numeric ranges, each of them yielded once."""
+
+    def __init__(self, segments):
+        self._segments = segments
+        self._length = None
+
+    def __iter__(self):
+        seen = set()
+        for segment in self._segments:
+            for alternative in segment:
+                if alternative not in seen:
+                    seen.add(alternative)
+                    yield alternative
+
+    def __len__(self):
+        if self._length is None:
+            self._length = sum(1 for _ in self)
+        return self._length
+
+
+class HostRange(object):
+    """
+    A host expression with numeric and alphabetic ranges, expanded natively instead of going through exrex.
+
+    Supported syntax:
+      [a-f], [abc], [0-9] - characters, the same way a regex character class works
+    and with ranges syntax turned on (it means something else in a regex, so it's off by default):
+      [001-500] or [1-3,7,10-12] - numeric ranges, zero-padded to the width of range start if it starts with 0
+      {a,b,c} - alternatives
+    Hosts are generated lazily, and their count is known before generating them. The count is exact
+    unless alternatives of different length make up the same hostname, like {a,ab}{bc,c}, then it's an upper bound.
+    """
+    _literal_characters = frozenset(string.ascii_letters + string.digits + '-_.')
+    _numeric_range_re = re.compile(r'^(\d+)-(\d+)$')
+    _character_range_re = re.compile(r'^([a-zA-Z0-9])-([a-zA-Z0-9])$')
+    _quantifier_re = re.compile(r'^\d*(,\d*)?$')
+
+    def __init__(self, parts):
+        self._parts = parts
+
+    @classmethod
+    def _is_literal(cls, s):
+        return len(s) > 0 and all(c in cls._literal_characters for c in s)
+
+    @classmethod
+    def _parse_characters(cls, content):
+        characters = OrderedDict()
+        i = 0
+        while i < len(content):
+            if i + 2 < len(content) and content[i + 1] == '-':
+                first, last = content[i], content[i + 2]
+                if ord(first) > ord(last):
+                    raise ValueError("Invalid range {0}-{1}".format(first, last))
+                characters.update((chr(x), None) for x in range(ord(first), ord(last) + 1))
+                i += 3
+            else:
+                characters[content[i]] = None
+                i += 1
+        return list(characters)
+
+    @classmethod
+    def _parse_brackets(cls, content, ranges):
+        if not content or not all(c in cls._literal_characters or c == ',' for c in content) or '.' in content or '_' in content:
+            return None
+        if not ranges:
+            return cls._parse_characters(content) if ',' not in content else None
+        if ',' not in content:
+            match = cls._numeric_range_re.match(content)
+            if match and (len(match.group(1)) > 1 or len(match.group(2)) > 1):
+                return _NumericRange(match.group(1), match.group(2))
+            return cls._parse_characters(content)
+
+        segments = list()
+        for item in content.split(','):
+            numeric_range_match = cls._numeric_range_re.match(item)
+            character_range_match = cls._character_range_re.match(item)
+            if numeric_range_match:
+                segments.append(_NumericRange(numeric_range_match.group(1), numeric_range_match.group(2)))
+            elif character_range_match:
+                segments.append(cls._parse_characters(item))
+            elif item.isalnum():
+                segments.append([item])
+            else:
+                return None
+        return _Alternatives(segments)
+
+    @classmethod
+    def _parse_braces(cls, content, ranges):
+        if not ranges or cls._quantifier_re.match(content):  # that's a regex quantifier, like in host[0-9]{2}
+            return None
+        alternatives = content.split(',')
+        if not all(cls._is_literal(x) for x in alternatives):
+            return None
+        return alternatives
+
+    @classmethod
+    def parse(cls, pattern, ranges=False):
+        """
+        :param ranges: whether to expand numeric ranges and {a,b} alternatives rather than leaving them to regex
+        :return: HostRange for the pattern, or None if pattern uses syntax other than ranges (i.e. is a real regex).
+        :raise ValueError: if a range is invalid
+        """
+        parts = list()
+        literal = ""
+        i = 0
+        while i < len(pattern):
+            c = pattern[i]
+            if c in cls._literal_characters:
+                literal += c
+                i += 1
+                continue
+            if c not in '[{':
+                return None
+            closing_position = pattern.find(']' if c == '[' else '}', i + 1)
+            if closing_position == -1:
+                return None
+            content = pattern[i + 1:closing_position]
+            part = cls._parse_brackets(content, ranges) if c == '[' else cls._parse_braces(content, ranges)
+            if part is None:
+                return None
+            if literal:
+                parts.append([literal])
+                literal = ""
+            parts.append(part)
+            i = closing_position + 1
+        if literal:
+            parts.append([literal])
+        return cls(parts)
+
+    def _generate(self, part_index, prefix):
+        if part_index == len(self._parts):
+            yield prefix
+            return
+        for item in self._parts[part_index]:
+            for host in self._generate(part_index + 1, prefix + item):
+                yield host
+
+    def __iter__(self):
+        return self._generate(0, "")
+
+    def count(self):
+        count = 1
+        for part in self._parts:
+            count *= len(part)
+        return count
+
+    def __len__(self):
+        return self.count()
+
+
+def compact(hosts):
+    """
+    Folds hostnames that differ only in a number into ranges, the way HostRange expands them.
+
+    :return: host expression, like 'web[01-03,07] db1'
+    """
+    numbered_host_re = re.compile(r'^(.*?)(\d+)(\D*)$')
+    groups = OrderedDict()
+    unpadded = list()
+    for host in sorted(set(hosts)):
+        match = numbered_host_re.match(host)
+        if match is None:
+            groups[(host, None, None)] = None
+            continue
+        prefix, number, suffix = match.groups()
+        if len(number) > 1 and number.startswith('0'):  # zero-padded numbers keep width
+            groups.setdefault((prefix, suffix, len(number)), list()).append(int(number))
+        else:
+            groups.setdefault((prefix, suffix, 0), list())
+            unpadded.append((prefix, suffix, number))
+    # a number as wide as zero-padded ones belongs to their range: web09 web10 is web[09-10]
+    for prefix, suffix, number in unpadded:
+        key = (prefix, suffix, len(number))
+        groups[key if key in groups else (prefix, suffix, 0)].append(int(number))
+
+    result = list()
+    for (prefix, suffix, width), numbers in groups.items():
+        if numbers == []:
+            continue
+        if numbers is None:
+            result.append(prefix)
+            continue
+        if len(numbers) == 1:
+            result.append("{0}{1}{2}".format(prefix, str(numbers[0]).zfill(width), suffix))
+            continue
+        numbers.sort()
+        segments = list()
+        start = previous = numbers[0]
+        for number in numbers[1:] + [None]:
+            if number is not None and number == previous + 1:
+                previous = number
+                continue
+            if start == previous:
+                segments.append(str(start).zfill(width))
+            else:
+                segments.append("{0}-{1}".format(str(start).zfill(width), str(previous).zfill(width)))
+            start = previous = number
+        result.append("{0}[{1}]{2}".format(prefix, ",".join(segments), suffix))
+    return " ".join(result)
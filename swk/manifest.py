@@ -0,0 +1,147 @@
+"""
+A module containing plugins manifest, letting swk know which plugin defines which commands and parsers
+without importing all of them.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+
+from swk import classes
+from swk import exceptions
+
+
+def import_plugin_module(module_name, path=None):
+    """
+    Imports a plugin module either from a plugins directory (if path is given) or as a part of installed package.
+    """
+    if path is not None:
+        if path not in sys.path:
+            sys.path.append(path)
+        return __import__(module_name)
+    return __import__(module_name, fromlist=[module_name[:module_name.rfind('.')]])
+
+
+class SWKLazyPlugin(object):
+    """
+    A stand-in for a plugin class, built from its manifest record.
+
+    It answers everything swk needs to know about plugin's commands and parsers from the record, and
+    imports plugin module only when the plugin object is about to be constructed.
+    """
+
+    def __init__(self, record):
+        self.__name__ = record['class']
+        self._record = record
+        self._plugin_class = None
+
+    def load(self):
+        if self._plugin_class is None:
+            try:
+                module = import_plugin_module(self._record['module'], self._record['path'])
+                self._plugin_class = getattr(module, self._record['class'])
+            except (ImportError, AttributeError) as e:
+                raise exceptions.PluginImportError("Couldn't import plugin {0} from module {1}: {2}".format(
+                    self._record['class'], self._record['module'], str(e)))
+            logging.debug("Lazily imported plugin {0} from module {1}".format(self.__name__, self._record['module']))
+        return self._plugin_class
+
+    def __call__(self, *args, **kwargs):
+        return self.load()(*args, **kwargs)
+
+    def __repr__(self):
+        return "<lazy plugin {0}>".format(self.__name__)
+
+    def get_commands(self):
+        return self._record['commands'].keys()
+
+    def get_command_help(self, command):
+        return self._record['commands'][command]['help']
+
+    def requires_hostlist(self, command):
+        return self._record['commands'][command]['requires_hostlist']
+
+    def streams_hostlist(self, command):
+        return self._record['commands'][command].get('streams_hostlist', False)
+
+    def commands_help(self):
+        return self._record['commands_help']
+
+    def get_parsers(self):
+        return self._record['parsers'].keys()
+
+    def get_parser_help(self, parser):
+        return self._record['parsers'][parser]['help']
+
+    def parsers_help(self):
+        return self._record['parsers_help']
+
+
+class SWKPluginsManifest(object):
+    """
+    Plugins manifest stored in swk cache directory.
+
+    The manifest is valid as long as its signature (plugins files mtimes, installed plugin packages versions, etc)
+    matches the one it's been built with and no plugin has failed to import while building it.
+    """
+    _manifest_filename = "plugins_manifest.json"
+
+    def __init__(self, cache_directory):
+        self._manifest_path = os.path.join(cache_directory, self._manifest_filename)
+
+    @staticmethod
+    def make_record(module_name, path, name, plugin_class):
+        is_command_plugin = issubclass(plugin_class, classes.SWKCommandPlugin)
+        is_parser_plugin = issubclass(plugin_class, classes.SWKParserPlugin)
+        record = {'module': module_name, 'path': path, 'class': name,
+                  'is_command_plugin': is_command_plugin, 'is_parser_plugin': is_parser_plugin,
+                  'commands': dict(), 'parsers': dict(), 'commands_help': "", 'parsers_help': ""}
+        if is_command_plugin:
+            for command in plugin_class.get_commands():
+                record['commands'][command] = {'help': plugin_class.get_command_help(command),
+                                               'requires_hostlist': plugin_class.requires_hostlist(command),
+                                               'streams_hostlist': plugin_class.streams_hostlist(command)}
+            record['commands_help'] = plugin_class.commands_help()
+        if is_parser_plugin:
+            for parser in plugin_class.get_parsers():
+                record['parsers'][parser] = {'help': plugin_class.get_parser_help(parser)}
+            record['parsers_help'] = plugin_class.parsers_help()
+        return record
+
+    def load(self, signature):
+        """
+        :return: plugin records, or None if manifest is missing or stale.
+        """
+        try:
+            with open(self._manifest_path) as f:
+                manifest = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+        if manifest.get('signature') != signature or manifest.get('failed_modules'):
+            logging.debug("Plugins manifest is stale")
+            return None
+        return manifest['plugins']
+
+    def save(self, signature, records, failed_modules):
+        manifest = {'signature': signature, 'plugins': records, 'failed_modules': failed_modules}
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(self._manifest_path), suffix=".tmp")
+            with os.fdopen(fd, 'w') as f:
+                json.dump(manifest, f)
+            os.rename(temp_path, self._manifest_path)
+        except (IOError, OSError) as e:
+            logging.error("Couldn't write plugins manifest {0}: {1}".format(self._manifest_path, str(e)))
+
+    def invalidate(self):
+        try:
+            os.remove(self._manifest_path)
+        except OSError:
+            pass
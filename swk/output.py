@@ -0,0 +1,165 @@
+"""
+A module containing swk output subsystem: everything commands print goes through a single writer.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import sys
+import time
+import atexit
+import threading
+import multiprocessing
+from six.moves import queue
+
+
+class SWKOutputWriter(object):
+    """
+    Writes output sent by any thread or worker process of swk, in the order it's been received.
+
+    Output is sent in pieces made of whole lines, and every piece is written at once, so lines from different
+    hosts never mix. Pieces piling up while the terminal is busy are written with a single call, and streams
+    are flushed when there's nothing more to write, flush_size bytes have been written or flush_interval seconds
+    have passed since the last flush.
+
+    Worker processes get a multiprocessing queue from worker_queue() via worker_init(), used as pool initializer.
+    """
+    _flush_marker = 'flush'
+    _stop_marker = 'stop'
+
+    def __init__(self, flush_interval=0.1, flush_size=65536):
+        self._flush_interval = flush_interval
+        self._flush_size = flush_size
+        self._queue = None  # (is_err, data) pieces
+        self._worker_queue = None
+        self._forwarder = None
+        self._is_worker = False
+        self._worker_queue_flushed = threading.Event()
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            if self._queue is not None:
+                return
+            self._queue = queue.Queue()
+            thread = threading.Thread(target=self._write_loop, name="swk output writer")
+            thread.daemon = True
+            thread.start()
+            atexit.register(self.flush)
+
+    def write(self, data, is_err=False):
+        """
+        :param data: one or several whole lines
+        """
+        if self._queue is None:
+            self._start()
+        self._queue.put((is_err, data))
+
+    def worker_queue(self):
+        """
+        :return: a queue worker processes send their output to. Pass it to worker_init in worker processes.
+        """
+        if self._queue is None:
+            self._start()
+        with self._lock:
+            if self._worker_queue is None:
+                self._worker_queue = multiprocessing.Queue()
+                self._forwarder = threading.Thread(target=self._forward_loop, name="swk output forwarder")
+                self._forwarder.daemon = True
+                self._forwarder.start()
+                atexit.register(self._stop_forwarder)
+        return self._worker_queue
+
+    def worker_init(self, worker_queue):
+        """Used as an initializer of worker processes, so that their output is sent to swk process."""
+        self._queue = worker_queue
+        self._is_worker = True
+
+    def flush(self):
+        """Waits until everything sent so far (by finished worker processes, too) is written."""
+        if self._queue is None or self._is_worker:
+            return
+        if self._worker_queue is not None:
+            self._worker_queue_flushed.clear()
+            self._worker_queue.put(self._flush_marker)
+            self._worker_queue_flushed.wait()
+        self._queue.join()
+
+    def _stop_forwarder(self):
+        # multiprocessing queue is closed when swk exits, forwarder must be done with it by then
+        self.flush()
+        self._worker_queue.put(self._stop_marker)
+        self._forwarder.join()
+        self._worker_queue = None
+
+    def _forward_loop(self):
+        while True:
+            piece = self._worker_queue.get()
+            if piece == self._flush_marker:
+                self._worker_queue_flushed.set()
+            elif piece == self._stop_marker:
+                return
+            else:
+                self._queue.put(piece)
+
+    @staticmethod
+    def _write_pieces(pieces):
+        # consecutive pieces for the same stream are written with a single call
+        stream, data = None, list()
+        for is_err, piece in pieces:
+            piece_stream = sys.stderr if is_err else sys.stdout
+            if piece_stream is not stream:
+                if stream is not None:
+                    stream.write("".join(data))
+                    stream.flush()  # not to mix up the order of stdout and stderr output
+                stream, data = piece_stream, list()
+            data.append(piece)
+        stream.write("".join(data))
+
+    def _write_loop(self):
+        last_flush = time.time()
+        written_since_flush = 0
+        while True:
+            pieces = [self._queue.get()]
+            size = len(pieces[0][1])
+            while size < self._flush_size:
+                try:
+                    pieces.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+                size += len(pieces[-1][1])
+
+            try:
+                self._write_pieces(pieces)
+                written_since_flush += size
+                if self._queue.empty() or written_since_flush >= self._flush_size or \
+                        time.time() - last_flush >= self._flush_interval:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    last_flush = time.time()
+                    written_since_flush = 0
+            except (IOError, OSError, ValueError):  # output is closed, e.g. swk is piped to head
+                pass
+            finally:
+                for _ in pieces:
+                    self._queue.task_done()
+
+
+writer = SWKOutputWriter()
+
+
+def write(data, is_err=False):
+    """Prints data, which must be whole lines, through swk output writer."""
+    writer.write(data, is_err)
+
+
+def flush():
+    writer.flush()
+
+
+def worker_init(worker_queue):
+    """Pool initializer for worker processes, see SWKOutputWriter.worker_queue."""
+    writer.worker_init(worker_queue)
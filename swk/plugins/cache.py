@@ -0,0 +1,45 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+from swk import classes
+from swk import cache
+from swk import output
+
+
+class CachePluginError(classes.SWKCommandError):
+    def __init__(self, message):
+        super(CachePluginError, self).__init__(message)
+
+
+class CachePlugin(classes.SWKCommandPlugin):
+    _commands = {'cache': {'requires_hostlist': False, 'help': 'Manages parsers results cache. '
+                                                               'Arguments: stats|purge\n'}}
+    _commands_help_message = "Cache plugin:\ncache - show parsers cache statistics (stats) or drop it (purge)\n\n"
+
+    def __init__(self, *args, **kwargs):
+        super(CachePlugin, self).__init__(*args, **kwargs)
+        self._cache = cache.SWKCache(self._cache_directory)
+
+    def _stats(self):
+        stats = self._cache.stats()
+        output.write("entries: {entries}\nsize: {size} bytes\nleast recently used: {oldest_access} "
+                     "seconds ago\n".format(**stats))
+
+    def _purge(self):
+        removed = self._cache.purge()
+        output.write("removed {0} entries\n".format(removed))
+
+    def run_command(self):
+        if len(self._command_args) == 0 or self._command_args[0] is None:
+            raise CachePluginError("Insufficient arguments.")
+        if self._command_args[0] == 'stats':
+            self._stats()
+        elif self._command_args[0] == 'purge':
+            self._purge()
+        else:
+            raise CachePluginError("Unknown cache subcommand {0}".format(self._command_args[0]))
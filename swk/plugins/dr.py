@@ -7,6 +7,7 @@ see swk/main.py for more information on License and contacts
 """
 
 from swk import classes
+from swk import output
 
 
 class DryRunPlugin(classes.SWKCommandPlugin):
@@ -17,8 +18,7 @@ class DryRunPlugin(classes.SWKCommandPlugin):
         super(DryRunPlugin, self).__init__(*args, **kwargs)
 
     def _run(self):
-        for host in self._hostlist:
-            print(host)
+        output.write("".join(host + '\n' for host in self._hostlist))
 
     def run_command(self):
         self._run()
@@ -0,0 +1,106 @@
+"""
+A module containing swk startup and execution phases profiler.
+
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import datetime
+import threading
+import contextlib
+
+
+class SWKProfiler(object):
+    """
+    Measures how long each phase of swk run takes.
+
+    When enabled, a JSON report with all the phases (and, optionally, a cProfile dump of the main thread)
+    is written to output directory as swk exits.
+    Profiling is turned on by --profile or --cprofile given before the command, or by SWK_PROFILE=1|cprofile
+    environment variable.
+    """
+    env_variable = 'SWK_PROFILE'
+    options_with_values = ('--output',)  # swk options followed by a separate value
+
+    def __init__(self, mode=None, output_directory="~/.swk"):
+        self._mode = mode
+        self.output_directory = output_directory
+        self._phases = list()
+        self._phases_lock = threading.Lock()
+        self._start_time = time.time()
+        self._cprofile = None
+        if self.enabled:
+            if self._mode == 'cprofile':
+                import cProfile
+                self._cprofile = cProfile.Profile()
+                self._cprofile.enable()
+            atexit.register(self.finish)
+
+    @classmethod
+    def from_environment(cls, argv, environ):
+        mode = environ.get(cls.env_variable)
+        if mode is not None:
+            mode = 'cprofile' if mode == 'cprofile' else ('json' if mode not in ('', '0', 'no') else None)
+
+        # only options given before the command count, everything after it belongs to the command
+        option_value_expected = False
+        for arg in argv:
+            if option_value_expected:
+                option_value_expected = False
+                continue
+            if not arg.startswith('-'):
+                break
+            option_value_expected = arg in cls.options_with_values
+            if arg == '--profile' and mode is None:
+                mode = 'json'
+            elif arg == '--cprofile':
+                mode = 'cprofile'
+        return cls(mode)
+
+    @property
+    def enabled(self):
+        return self._mode is not None
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.time()
+        try:
+            yield
+        finally:
+            end = time.time()
+            with self._phases_lock:
+                self._phases.append({'name': name, 'start': start - self._start_time, 'duration': end - start,
+                                     'thread': threading.current_thread().name})
+
+    def finish(self):
+        if not self.enabled:
+            return
+        if self._cprofile is not None:
+            self._cprofile.disable()
+        output_directory = os.path.abspath(os.path.expanduser(self.output_directory))
+        report_basename = os.path.join(output_directory, "profile-{0}-{1}".format(
+            datetime.datetime.fromtimestamp(self._start_time).strftime('%Y%m%d-%H%M%S'), os.getpid()))
+        report = {'argv': sys.argv, 'pid': os.getpid(), 'started': self._start_time,
+                  'total': time.time() - self._start_time,
+                  'phases': sorted(self._phases, key=lambda x: x['start'])}
+        try:
+            with open(report_basename + '.json', 'w') as f:
+                json.dump(report, f, indent=2)
+            sys.stderr.write("Profile report written to {0}.json\n".format(report_basename))
+            if self._cprofile is not None:
+                self._cprofile.dump_stats(report_basename + '.prof')
+                sys.stderr.write("cProfile stats written to {0}.prof\n".format(report_basename))
+        except (IOError, OSError) as e:
+            sys.stderr.write("Couldn't write profile report: {0}\n".format(str(e)))
+        self._mode = None
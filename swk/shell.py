@@ -14,6 +14,8 @@ import sys
 import logging
 from swk import classes
 from swk import exceptions
+from swk import output
+from swk.helper_functions import SWKHelperFunctions
 from pypsi.commands.exit import ExitCommand
 from pypsi.commands.pwd import PwdCommand
 from pypsi.commands.chdir import ChdirCommand
@@ -123,6 +125,7 @@ class SWKCommand(Command):
 
     def _die(self, diemsg):
         logging.error(diemsg)
+        output.flush()
         sys.stderr.write(diemsg + '\n')
 
     def run(self, shell, args):
@@ -159,12 +162,23 @@ class SWKCommand(Command):
                                               cache_directory=self._swk_instance._cache_directory_expanded,
                                               called_from_shell=True)
 
-        logging.info("Executing command with config: {0}".format(self._swk_instance._config[self._command_executer_name]))
-        obj = self._command_executer_class(**self._swk_instance._config[self._command_executer_name])
+        logging.info("Executing command with config: {0}".format(
+            SWKHelperFunctions.loggable_config(self._swk_instance._config[self._command_executer_name])))
+        try:
+            obj = self._command_executer_class(**self._swk_instance._config[self._command_executer_name])
+        except exceptions.PluginImportError as e:
+            self._swk_instance._plugins_manifest.invalidate()
+            self._die("Plugin error: {0}".format(str(e)))
+            return
+        except classes.SWKCommandError as e:
+            self._die("Command error: {0}".format(str(e)))
+            return
         try:
             obj.run_command()
         except classes.SWKCommandError as e:
             self._die("Command error: {0}".format(str(e)))
+        finally:
+            output.flush()  # command's output must be written before the next prompt
 
 
 class SWKShell(Shell):
@@ -19,11 +19,19 @@ import argparse
 from six.moves import configparser
 import sys
 import exrex
-import pkg_resources
 from swk import version
 import shutil
-from swk import check_updates
+from swk import hostlist
+from swk import cache
+from swk import manifest
+from swk import entry_points
+from swk import profiling
+from swk import output
+from swk.helper_functions import SWKHelperFunctions
 import datetime
+import json
+import subprocess
+import multiprocessing.pool
 
 shell_mode_off = False
 try:
@@ -48,6 +56,12 @@ class SwissKnife(object):
     _swk_check_updates_marker_full_path = os.path.join(os.path.expanduser(_swk_config_path),
                                                        _swk_check_updates_marker_filename)
     _swk_check_updates_period = 60 * 60 * 24
+    _swk_check_updates_report_filename = 'updates_report.json'
+
+    # hostgroup prefixes: '-' excludes hosts from the list, '&' leaves only hosts present in both
+    _hostlist_operations = ('-', '&')
+    # parser options that don't change parsing results, so they're not a part of parsers cache key
+    _cache_key_ignored_options = ('hostgroup', 'hostgroup_modifier', 'cache_ttl', 'cache_stale_ttl')
 
     def _write_default_config(self):
         if not os.path.isdir(os.path.dirname(self._swk_config_full_path)):
@@ -66,7 +80,43 @@ class SwissKnife(object):
                 msg = "Couldn't create default config at {path}, aborting.".format(path=self._swk_config_full_path)
                 self._die(msg)
 
+    def _print_updates_report(self, package_version_dict):
+        try:
+            with open(self._swk_check_updates_report_full_path) as f:
+                report = json.load(f)
+            os.remove(self._swk_check_updates_report_full_path)
+        except (IOError, OSError, ValueError):
+            return
+
+        for package_name in report.get('errors', []):
+            if package_name is None:
+                msg = "Couldn't run check for new versions. Please check your Internet settings or turn " \
+                      "checking for updates off " \
+                      "in {0}.".format(self._swk_config_filename)
+            else:
+                msg = "Couldn't run check for new versions of {package}. " \
+                      "Please check your Internet settings or turn " \
+                      "checking for updates off " \
+                      "in {conf_file}.".format(conf_file=self._swk_config_filename, package=package_name)
+            logging.error(msg)
+            sys.stderr.write(msg + '\n')
+            sys.stderr.flush()
+
+        for notice in report.get('notices', []):
+            if package_version_dict.get(notice['package']) != notice['installed']:
+                continue  # already upgraded since the check
+            msg = "You're using {package} v{old}, but v{new} is available! Please upgrade.\n".format(
+                old=notice['installed'], new=notice['latest'], package=notice['package'])
+            sys.stderr.write(msg)
+            logging.info(msg)
+
     def _check_updates(self, package_version_dict):
+        """
+        Prints what the previous check has found and, once in a while, starts a new check in a detached process,
+        so checking for updates never slows swk down.
+        """
+        self._print_updates_report(package_version_dict)
+
         now = datetime.datetime.utcnow()
         now_timestamp = (now - datetime.datetime(1970, 1, 1)).total_seconds()
         try:
@@ -74,47 +124,27 @@ class SwissKnife(object):
         except (IOError, OSError):
             check_updates_marker_mtime = now_timestamp - (self._swk_check_updates_period + 1)
         if now_timestamp - check_updates_marker_mtime > self._swk_check_updates_period:
-            try:
-                cheese_shop = check_updates.CheeseShop()
-            except:
-                msg = "Couldn't run check for new versions. Please check your Internet settings or turn " \
-                      "checking for updates off " \
-                      "in {0}.".format(self._swk_config_filename)
-                logging.error(msg)
-                sys.stderr.write(msg + '\n')
-                sys.stderr.flush()
-                return
-            for k, v in package_version_dict.items():
-                package_name = k
-                installed_version = v
-                try:
-                    last_version = cheese_shop.package_releases(package_name)[0]
-                except:
-                    msg = "Couldn't run check for new versions of {package}. " \
-                          "Please check your Internet settings or turn " \
-                          "checking for updates off " \
-                          "in {conf_file}.".format(conf_file=self._swk_config_filename, package=package_name)
-                    logging.error(msg)
-                    sys.stderr.write(msg + '\n')
-                    sys.stderr.flush()
-                    last_version = installed_version
-                if check_updates.get_highest_version([installed_version, last_version]) != installed_version:
-                    sys.stderr.write("You're using {package} v{old}, but v{new} is available! Please upgrade.\n".format(
-                        old=installed_version, new=last_version, package=package_name
-                    ))
-                    logging.info("You're using {package} v{old}, but v{new} is available! Please upgrade.\n".format(
-                        old=installed_version, new=last_version, package=package_name
-                    ))
-
+            # touch the marker first, so concurrent swk runs don't start checks of their own
             with open(self._swk_check_updates_marker_full_path, mode='w'):
                 pass
+            try:
+                with open(os.devnull, 'r+') as devnull:
+                    subprocess.Popen([sys.executable, '-m', 'swk.check_updates',
+                                      self._swk_check_updates_report_full_path, json.dumps(package_version_dict)],
+                                     cwd=os.path.dirname(self._swk_dir), stdin=devnull, stdout=devnull,
+                                     stderr=devnull, close_fds=True, preexec_fn=os.setsid)
+            except OSError as e:
+                logging.error("Couldn't start checking for new versions: {0}".format(str(e)))
 
     def __init__(self, **kwargs):
         for k, v in kwargs.items():
             setattr(self, "_{0}".format(k), v)
 
+        self._profiler = profiling.SWKProfiler.from_environment(sys.argv[1:], os.environ)
+
         self._write_default_config()
-        self._config = self._read_config()
+        with self._profiler.phase("_read_config"):
+            self._config = self._read_config()
         
         self._logging_init()
 
@@ -125,15 +155,29 @@ class SwissKnife(object):
         self._cache_directory_expanded = os.path.abspath(os.path.expanduser(self._config["Main"].get("cache_directory",
                                                                                                   "~/.swk")))
         self._cache_directory_init()
+        self._profiler.output_directory = self._cache_directory_expanded
+        self._swk_check_updates_report_full_path = os.path.join(self._cache_directory_expanded,
+                                                                self._swk_check_updates_report_filename)
+        self._cache = cache.SWKCache(self._cache_directory_expanded,
+                                     max_size=int(self._config["Main"].get("cache_max_size", 10 * 1024 * 1024)))
+        self._cache_ttl = int(self._config["Main"].get("cache_ttl", 0))
+        self._cache_stale_ttl = int(self._config["Main"].get("cache_stale_ttl", 60))
+
+        self._parsers_threads_count = int(self._config["Main"].get("parsers_threads_count", 8))
+        self._host_ranges = self._config["Main"].get("host_ranges", "no") == "yes"
 
         self._swk_plugins_dirs = [os.path.expanduser(x) for x in self._config["Main"].get("plugins_directories", "").split()]
         self._swk_plugins_dirs.append("{0}/{1}".format(self._swk_dir, self.swk_plugin_dir_default))
-        self._plugin_modules, self._plugin_command_modules, self._plugin_parser_modules,\
-            modules_package_version_dict = self._modules_import()
+        self._plugins_manifest = manifest.SWKPluginsManifest(self._cache_directory_expanded)
+        self._entry_points_cache = entry_points.SWKEntryPointsCache(self._cache_directory_expanded)
+        with self._profiler.phase("_modules_import"):
+            self._plugin_modules, self._plugin_command_modules, self._plugin_parser_modules,\
+                modules_package_version_dict = self._modules_import()
 
         package_version_dict.update(modules_package_version_dict)
         if self._config["Main"].get("check_for_updates", "no") == "yes":
-            self._check_updates(package_version_dict)
+            with self._profiler.phase("_check_updates"):
+                self._check_updates(package_version_dict)
 
         self._available_commands, self._available_parsers = self._get_available_commands_and_parsers()
         self._commands_help_message, self._parsers_help_message, \
@@ -141,7 +185,8 @@ class SwissKnife(object):
 
         self._config = self._add_empty_sections_to_config()  # now that we know what's imported
 
-        self._args = self._parse_args()
+        with self._profiler.phase("_parse_args"):
+            self._args = self._parse_args()
 
         self._command = self._args["command"]
 
@@ -189,85 +234,96 @@ class SwissKnife(object):
     @staticmethod
     def _die(diemsg):
         logging.error(diemsg)
+        output.flush()
         sys.stderr.write(diemsg + '\n')
         logging.debug("swk died")
         exit(2)
 
-    def _modules_import(self):
+    def _discover_plugin_modules(self):
+        """
+        Finds plugin modules without importing them.
 
-        module_filenames = list()
-        plugin_modules = list()
-        plugin_command_modules = list()
-        plugin_parser_modules = list()
+        :return: a list of (module_name, plugins directory or None for installed packages), a signature
+            that changes whenever any of the plugins might have changed, and installed plugin packages versions.
+        """
+        plugin_modules_sources = list()
         package_version_dict = dict()
-        oldcwd = os.getcwd()
+        signature = {'python': list(sys.version_info[:2]), 'swk': self._version,
+                     'files': list(), 'distributions': list()}
 
         # directory imports
 
         for swk_plugins_dir in self._swk_plugins_dirs:
-            try:
-                swk_plugins_dir_abspath = os.path.abspath(swk_plugins_dir)
-                os.chdir(swk_plugins_dir_abspath)
-                module_filenames = glob.glob("*.py")
-            except OSError:
+            swk_plugins_dir_abspath = os.path.abspath(swk_plugins_dir)
+            if not os.path.isdir(swk_plugins_dir_abspath):
                 self._die("{0} does not exist.".format(swk_plugins_dir_abspath))
 
-            """import all the plugin modules and put them into list"""
-
-            for module_filename in module_filenames:
-                module_name, _, _ = module_filename.rpartition('.py')
+            for module_path in sorted(glob.glob(os.path.join(swk_plugins_dir_abspath, "*.py"))):
+                module_name, _, _ = os.path.basename(module_path).rpartition('.py')
                 if module_name in self._disabled_plugins or module_name in ['__init__']:
                     continue
-
                 try:
-                    sys.path.append(os.getcwd())
-                    module = __import__(module_name)
-                except ImportError as e:
-                    # self._die("Couldn't import module {0}: {1}.".format(module_name, str(e)))
-                    logging.error("Couldn't import module {0}: {1}.".format(module_name, str(e)))
+                    module_stat = os.stat(module_path)
+                except OSError:
                     continue
-                plugin_modules.extend([(name, obj) for (name, obj) in inspect.getmembers(module)
-                                       if inspect.isclass(obj) and issubclass(obj, classes.SWKPlugin)])
-        os.chdir(oldcwd)
+                plugin_modules_sources.append((module_name, swk_plugins_dir_abspath))
+                signature['files'].append([module_path, module_stat.st_mtime, module_stat.st_size])
 
         # entry_points imports
-        for entry_point in pkg_resources.iter_entry_points(group='swk_plugin', name=None):
-            #first variant
-            module_name = entry_point.module_name
+        with self._profiler.phase("entry points"):
+            swk_entry_points = self._entry_points_cache.entry_points('swk_plugin')
+        for entry_point in swk_entry_points:
+            module_name = entry_point['module']
 
             if module_name in self._disabled_plugins or module_name in ['__init__']:
                 continue
+            plugin_modules_sources.append((module_name, None))
+            signature['distributions'].append([module_name, entry_point['distribution'], entry_point['version']])
+            package_version_dict[entry_point['distribution']] = entry_point['version']
+
+        return plugin_modules_sources, signature, package_version_dict
+
+    def _import_plugin_modules(self, plugin_modules_sources):
+        plugin_modules = list()
+        plugin_records = list()
+        failed_modules = list()
+
+        for module_name, swk_plugins_dir in plugin_modules_sources:
+            """import all the plugin modules and put them into list"""
             try:
-                module = __import__(module_name, fromlist=[module_name[:module_name.rfind('.')]])
+                with self._profiler.phase("import {0}".format(module_name)):
+                    module = manifest.import_plugin_module(module_name, swk_plugins_dir)
             except ImportError as e:
                 # self._die("Couldn't import module {0}: {1}.".format(module_name, str(e)))
                 logging.error("Couldn't import module {0}: {1}.".format(module_name, str(e)))
+                failed_modules.append(module_name)
                 continue
-            try:
-                package_version = __import__(module_name[:module_name.rfind('.')] + '.version',
-                                             fromlist=[module_name[:module_name.rfind('.')]])
-                package_version_dict[module_name[:module_name.rfind('.')]] = package_version.__version__
-            except ImportError:
-                pass
 
-            plugin_modules.extend([(name, obj) for (name, obj) in inspect.getmembers(module)
-                                   if inspect.isclass(obj) and issubclass(obj, classes.SWKPlugin)])
 
-            #second variant
-            """
-            package_name = entry_point.module_name
-            package = __import__(package_name)
-            for module in inspect.getmembers(package):
-                plugin_modules.extend([(name, obj) for (name, obj) in inspect.getmembers(module)
-                                           if inspect.isclass(obj) and issubclass(obj, swk_classes.SWKPlugin)])
-            """
+            for name, obj in inspect.getmembers(module):
+                if inspect.isclass(obj) and issubclass(obj, classes.SWKPlugin):
+                    plugin_modules.append((name, obj))
+                    plugin_records.append(manifest.SWKPluginsManifest.make_record(module_name, swk_plugins_dir,
+                                                                                   name, obj))
+
+        return plugin_modules, plugin_records, failed_modules
+
+    def _modules_import(self):
+        plugin_modules_sources, signature, package_version_dict = self._discover_plugin_modules()
 
+        plugin_records = self._plugins_manifest.load(signature)
+        if plugin_records is None:
+            plugin_modules, plugin_records, failed_modules = self._import_plugin_modules(plugin_modules_sources)
+            self._plugins_manifest.save(signature, plugin_records, failed_modules)
+        else:
+            # nothing has changed since the manifest was built, so plugins are imported only when they're used
+            plugin_modules = [(record['class'], manifest.SWKLazyPlugin(record)) for record in plugin_records]
 
         """then sort them into command modules and parser modules"""
-        plugin_command_modules.extend([(name, obj) for (name, obj) in plugin_modules
-                                       if issubclass(obj, classes.SWKCommandPlugin)])
-        plugin_parser_modules.extend([(name, obj) for (name, obj) in plugin_modules
-                                      if issubclass(obj, classes.SWKParserPlugin)])
+        plugin_command_modules = [plugin_module for plugin_module, record in zip(plugin_modules, plugin_records)
+                                  if record['is_command_plugin']]
+        plugin_parser_modules = [plugin_module for plugin_module, record in zip(plugin_modules, plugin_records)
+                                 if record['is_parser_plugin']]
 
         logging.debug("Imported modules")
         logging.debug("All modules: {0}".format(plugin_modules))
@@ -342,6 +398,22 @@ class SwissKnife(object):
                                nargs='?')
         argparser.add_argument('command_args', help='additional arguments for chosen command.', nargs=argparse.REMAINDER)
         argparser.add_argument('--version', action="version", version="%(prog)s {0}".format(self._version))
+        argparser.add_argument('--profile', action='store_true',
+                               help='time each phase of swk run and write a JSON report to cache directory. '
+                                    'Can also be enabled by {0}=1 environment variable'.format(
+                                       profiling.SWKProfiler.env_variable))
+        argparser.add_argument('--cprofile', action='store_true',
+                               help='same as --profile, but also write a cProfile dump. '
+                                    'Can also be enabled by {0}=cprofile environment variable'.format(
+                                       profiling.SWKProfiler.env_variable))
+
+        argparser.add_argument('--output', type=str,
+                               help='output mode for commands that support it, overrides the one set in config. '
+                                    'ssh, pssh, dist and gather support: lines (default), jsonl. '
+                                    'ssh and pssh support collate, too')
+        argparser.add_argument('--stats', action='store_true',
+                               help='print timing and throughput stats for commands that support it '
+                                    '(ssh, pssh, dist and gather)')
 
         args = argparser.parse_args(sys.argv[1:])
 
@@ -349,6 +421,8 @@ class SwissKnife(object):
         result['hostlist'] = args.hostlist
 
         result['command_args'] = args.command_args
+        result['output'] = args.output
+        result['stats'] = args.stats
 
         return result
 
@@ -379,7 +453,8 @@ class SwissKnife(object):
         for module_name, _ in self._plugin_parser_modules:
             if module_name not in config:
                 config[module_name] = dict()
-        logging.debug("Added missing sections to config. Now config is: {0}".format(config))
+        logging.debug("Added missing sections to config. Now config is: {0}".format(
+            SWKHelperFunctions.loggable_config(config)))
         return config
 
     def _find_command_executer_class(self):
@@ -410,7 +485,8 @@ class SwissKnife(object):
         config = self._config[class_name]
         for k, v in kwargs.items():
             config[k] = v
-        logging.debug("Updated config for class {0}. Now its config is: {1}".format(class_name, config))
+        logging.debug("Updated config for class {0}. Now its config is: {1}".format(
+            class_name, SWKHelperFunctions.loggable_config(config)))
         return config
 
     def _escape_unsafe_characters(self, string):
@@ -422,12 +498,84 @@ class SwissKnife(object):
             self._die("Unsafe characters found in hostlist. Exiting")
 
 
+    def _expand_host_expression(self, host_expression):
+        try:
+            host_range = hostlist.HostRange.parse(host_expression, ranges=self._host_ranges)
+        except ValueError as e:
+            raise exceptions.ExpandingHostlistError("Error in host expression {0}: {1}".format(host_expression, str(e)))
+        if host_range is not None:
+            logging.debug("Host expression {0} is a range of {1} hosts".format(host_expression, host_range.count()))
+            return host_range
+
+        # real regex syntax is used, so we have to generate hosts with exrex
+        escaped_host_expression = self._escape_unsafe_characters(host_expression)
+        self._die_if_unsafe_characters(escaped_host_expression)
+        return list(exrex.generate(escaped_host_expression, limit=1000))
+
     def _read_hostlist_from_stdin(self):
         hostlist_lines = sys.stdin.readlines()
         self._hostlist += '\n'.join(hostlist_lines)
 
+    def _stream_hostlist_from_stdin(self):
+        """
+        Yields hosts read from stdin as soon as each line arrives, skipping the ones already yielded.
+
+        Only the hosts themselves are kept in memory, and stdin is read no faster than hosts are consumed.
+        """
+        streamed_hosts = set()
+        for line in iter(sys.stdin.readline, ''):
+            for hostgroup in line.split():
+                if hostgroup[0] in self._hostlist_operations:
+                    raise exceptions.ExpandingHostlistError("{0}: excluding and intersecting hostgroups isn't "
+                                                            "supported when streaming hosts from stdin".format(
+                                                                hostgroup))
+                if hostgroup[0] in self._available_parsers:
+                    obj, parser_name = self._make_parser(hostgroup[0], hostgroup[1:])
+                    hostlist_addition = self._parse_hostgroup(obj, parser_name, hostgroup[0], hostgroup[1:])
+                elif hostgroup[0].isalnum():
+                    hostlist_addition = self._expand_host_expression(hostgroup)
+                else:
+                    raise exceptions.ExpandingHostlistError("Couldn't find corresponding parser for {0} "
+                                                            "modifier.".format(hostgroup[0]))
+                for host in hostlist_addition:
+                    if host not in streamed_hosts:
+                        streamed_hosts.add(host)
+                        yield host
+
+    def _make_parser(self, hostgroup_modifier, hostgroup):
+        parser = self._available_parsers[hostgroup_modifier]
+        parser_name = parser.__name__
+        self._config[parser_name] = self._update_config(parser_name, hostgroup_modifier=hostgroup_modifier,
+                                                        hostgroup=hostgroup)
+        try:
+            with self._profiler.phase("load {0}".format(parser_name)):
+                return parser(**self._config[parser_name]), parser_name
+        except exceptions.PluginImportError as e:
+            self._plugins_manifest.invalidate()
+            raise exceptions.ExpandingHostlistError(str(e))
+
+    def _parse_hostgroup(self, parser_obj, parser_name, hostgroup_modifier, hostgroup):
+        def _parse():
+            try:
+                hostlist_addition = parser_obj.parse()
+            except classes.SWKParsingError as e:
+                raise exceptions.ExpandingHostlistError("Parser {0} died with message: {1}".format(parser_name, str(e)))
+            if len(hostlist_addition) == 0:
+                raise exceptions.ExpandingHostlistError("Parser {0} didn't return any hosts for hostgroup {1}".format(
+                    parser_name, hostgroup
+                ))
+            return list(hostlist_addition)
+
+        parser_config = self._config[parser_name]
+        cache_ttl = int(parser_config.get("cache_ttl", self._cache_ttl))
+        cache_stale_ttl = int(parser_config.get("cache_stale_ttl", self._cache_stale_ttl))
+        cache_key = (parser_name, cache.config_digest(parser_config, self._cache_key_ignored_options),
+                     hostgroup_modifier, hostgroup)
+        with self._profiler.phase("parser {0} {1}{2}".format(parser_name, hostgroup_modifier, hostgroup)):
+            return self._cache.get_or_refresh(cache_key, _parse, cache_ttl, cache_stale_ttl)
+
     def _expand_hostlist(self):
-        expanded_hostlist = list()  # expanded
+        expanded_hostlist = hostlist.HostList()  # expanded
 
         if (self._hostlist[0] == "'" and self._hostlist[-1] == "'") or \
                 (self._hostlist[0] == '"' and self._hostlist[-1] == '"'):
@@ -440,51 +588,62 @@ class SwissKnife(object):
             self._read_hostlist_from_stdin()
 
         hostgroups = self._hostlist.split()
+        hostgroups_parsed = list()
 
         for hostgroup in hostgroups:
-            hostlist_addition = list()
-            negation = False
+            operation = None
             hostgroup_modifier = hostgroup[0]  # the first symbol
             hostgroup_remainder = hostgroup[1:]
 
-            if hostgroup_modifier == '-':
-                negation = True
+            if hostgroup_modifier in self._hostlist_operations:
+                operation = hostgroup_modifier
                 hostgroup_modifier = hostgroup[1]
                 hostgroup_remainder = hostgroup[2:]
                 hostgroup = hostgroup[1:]
 
-            if hostgroup_modifier not in self._available_parsers:
-                if not hostgroup_modifier.isalnum():
-                    raise exceptions.ExpandingHostlistError("Couldn't find corresponding parser for {0} modifier.".format(hostgroup_modifier))
-                else:  # hostgroup is a host or a regex, not a group
-                    escaped_hostgroup = self._escape_unsafe_characters(hostgroup)
-                    self._die_if_unsafe_characters(escaped_hostgroup)
-                    hostlist_addition = list(exrex.generate(escaped_hostgroup, limit=1000))
-                    # hostlist_addition.append(hostgroup)
-            else:  # we must call a parser
-                parser = self._available_parsers[hostgroup_modifier]
-                parser_name = parser.__name__
-                self._config[parser_name] = self._update_config(parser_name, hostgroup_modifier=hostgroup_modifier,
-                                                                hostgroup=hostgroup_remainder)
-                obj = parser(**self._config[parser_name])
-                try:
-                    hostlist_addition = obj.parse()
-                    if len(hostlist_addition) == 0:
-                        raise exceptions.ExpandingHostlistError("Parser {0} didn't return any hosts for hostgroup {1}".format(
-                            parser.__name__, hostgroup_remainder
-                        ))
-                except classes.SWKParsingError as e:
-                    raise exceptions.ExpandingHostlistError("Parser {0} died with message: {1}".format(parser.__name__, str(e)))
-
-            if not negation:
-                # don't add host twice
-                expanded_hostlist.extend([x for x in hostlist_addition if x not in expanded_hostlist])
-            else:
-                # delete host from list if present
-                expanded_hostlist = [x for x in expanded_hostlist if x not in hostlist_addition]
+            if hostgroup_modifier not in self._available_parsers and not hostgroup_modifier.isalnum():
+                raise exceptions.ExpandingHostlistError("Couldn't find corresponding parser for {0} modifier.".format(hostgroup_modifier))
+            hostgroups_parsed.append((operation, hostgroup, hostgroup_modifier, hostgroup_remainder))
+
+        # parsers usually ask some remote API, so all of them are called concurrently,
+        # while the results are still applied from left to right below
+        parsers_count = len([x for x in hostgroups_parsed if x[2] in self._available_parsers])
+        if parsers_count > 0:
+            pool = multiprocessing.pool.ThreadPool(processes=min(self._parsers_threads_count, parsers_count))
+        else:
+            pool = None
+
+        try:
+            hostlist_additions = list()
+            for operation, hostgroup, hostgroup_modifier, hostgroup_remainder in hostgroups_parsed:
+                if hostgroup_modifier not in self._available_parsers:
+                    # hostgroup is a host, a range or a regex, not a group
+                    hostlist_additions.append(self._expand_host_expression(hostgroup))
+                else:  # we must call a parser
+                    obj, parser_name = self._make_parser(hostgroup_modifier, hostgroup_remainder)
+                    hostlist_additions.append(pool.apply_async(self._parse_hostgroup,
+                                                               (obj, parser_name, hostgroup_modifier,
+                                                                hostgroup_remainder)))
+
+            for (operation, _, _, _), hostlist_addition in zip(hostgroups_parsed, hostlist_additions):
+                if isinstance(hostlist_addition, multiprocessing.pool.AsyncResult):
+                    hostlist_addition = hostlist_addition.get()
+
+                if operation is None:
+                    # don't add host twice
+                    expanded_hostlist.update(hostlist_addition)
+                elif operation == '-':
+                    # delete host from list if present
+                    expanded_hostlist.difference_update(hostlist_addition)
+                elif operation == '&':
+                    # leave only hosts present in both lists
+                    expanded_hostlist.intersection_update(hostlist_addition)
+        finally:
+            if pool is not None:
+                pool.terminate()
 
         logging.debug("Expanded hostlist: {0}".format(expanded_hostlist))
-        return sorted(expanded_hostlist)
+        return expanded_hostlist.sorted()
 
     def run(self):
         if self._command == 'shell':
@@ -497,13 +656,23 @@ class SwissKnife(object):
             sys.exit(exit_status)
 
         if self._command_requires_hostlist:
-            try:
-                expanded_hostlist = self._expand_hostlist()
-            except exceptions.ExpandingHostlistError as e:
-                self._die(str(e))
+            if self._hostlist == '-' and self._command_executer_class.streams_hostlist(self._command):
+                # hosts are expanded while the command runs
+                expanded_hostlist = self._stream_hostlist_from_stdin()
+            else:
+                try:
+                    with self._profiler.phase("_expand_hostlist"):
+                        expanded_hostlist = self._expand_hostlist()
+                except exceptions.ExpandingHostlistError as e:
+                    self._die(str(e))
         else:
             expanded_hostlist = list()
 
+        if self._args["output"] is not None:
+            self._update_config(self._command_executer_name, output=self._args["output"])
+        if self._args["stats"]:
+            self._update_config(self._command_executer_name, stats="yes")
+
         self._config[self._command_executer_name] = self._update_config(self._command_executer_name,
                                                                         hostlist=expanded_hostlist,
                                                                         command=self._command,
@@ -513,12 +682,23 @@ class SwissKnife(object):
                                                                         cwd=self._cwd,
                                                                         cache_directory=self._cache_directory_expanded)
 
-        logging.info("Executing command with config: {0}".format(self._config[self._command_executer_name]))
-        obj = self._command_executer_class(**self._config[self._command_executer_name])
+        logging.info("Executing command with config: {0}".format(
+            SWKHelperFunctions.loggable_config(self._config[self._command_executer_name])))
+        try:
+            with self._profiler.phase("load {0}".format(self._command_executer_name)):
+                obj = self._command_executer_class(**self._config[self._command_executer_name])
+        except exceptions.PluginImportError as e:
+            self._plugins_manifest.invalidate()
+            self._die(str(e))
+        except classes.SWKCommandError as e:
+            self._die("Command class {0} died with message: {1}".format(self._command_executer_name, str(e)))
 
         try:
-            obj.run_command()
+            with self._profiler.phase("command {0}".format(self._command)):
+                obj.run_command()
         except classes.SWKCommandError as e:
             self._die("Command class {0} died with message: {1}".format(self._command_executer_name, str(e)))
+        except exceptions.ExpandingHostlistError as e:
+            self._die(str(e))
         logging.debug("swk finished")
 
@@ -1 +1 @@
-__version__ = "0.0.4a18"
+__version__ = "0.0.4a19"
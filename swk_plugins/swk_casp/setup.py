@@ -9,7 +9,7 @@ setup(name='swk_casp',
       version=version['__version__'],
       packages=find_packages(),
       install_requires=[
-          'swk>=0.0.4a4',
+          'swk>=0.0.4a19',
           'requests>=2.9.1'
       ],
       description='Plugin for swk, enabling casp api',
@@ -7,8 +7,8 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 import requests
-import sys
 import logging
 
 
@@ -90,7 +90,7 @@ class CaspPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
                 result.append(group)
 
         for part in sorted(result):
-            sys.stdout.write(part + "\n")
+            output.write(part + "\n")
 
     def parse(self):
         if not self._hostgroup == 'ALL':
@@ -1 +1 @@
-__version__ = "0.0.2a3"
+__version__ = "0.0.2a4"
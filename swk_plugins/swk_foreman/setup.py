@@ -9,7 +9,7 @@ setup(name='swk_foreman',
       version=version['__version__'],
       packages=find_packages(),
       install_requires=[
-          'swk>=0.0.4a4',
+          'swk>=0.0.4a19',
           'python-foreman>=0.4.5'
       ],
       description='Plugin for swk, enabling Foreman api',
@@ -7,6 +7,7 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 from foreman.client import Foreman, ForemanException
 from swk.helper_functions import SWKHelperFunctions
 import sys
@@ -184,7 +185,7 @@ class ForemanPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
             try:
                 SWKHelperFunctions.print_line_with_host_prefix("", host_info['name'])
                 for puppet_class in host_info['all_puppetclasses']:
-                    print(puppet_class['name'])
+                    output.write(puppet_class['name'] + '\n')
             except KeyError:
                 raise ForemanError("Foreman info about host says it has no 'all_puppetclasses' field")
             except TypeError:
@@ -270,7 +271,7 @@ class ForemanPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
     def _lscls(self):
         all_classes_short_info = self._get_all_classes_short_info()
         for class_short_info in sorted(all_classes_short_info, key=lambda x: x['name']):
-            print(class_short_info['name'])
+            output.write(class_short_info['name'] + '\n')
 
     def _getgcls(self):
         logging.debug("hostgroups methods: {0}".format(dir(self._fapi.hostgroups)))
@@ -279,7 +280,7 @@ class ForemanPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
             try:
                 SWKHelperFunctions.print_line_with_host_prefix("", hostgroup_info['name'])
                 for puppet_class in hostgroup_info['puppetclasses']:
-                    print(puppet_class['name'])
+                    output.write(puppet_class['name'] + '\n')
             except KeyError:
                 raise ForemanError("Foreman info about group says it has no 'puppetclasses' field")
             except TypeError:
@@ -333,7 +334,7 @@ class ForemanPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
         except ForemanException as e:
             raise ForemanError("Most probably your search criteria is not supported.")
         for result in search_results:
-            print(result['name'])
+            output.write(result['name'] + '\n')
 
     def _srch(self):
         self._search(self._fapi.hosts.index)
@@ -359,13 +360,13 @@ class ForemanPlugin(classes.SWKParserPlugin, classes.SWKCommandPlugin):
                                                          )['results']
                 connected_hosts_names = [x['name'] for x in connected_hosts_info]
             SWKHelperFunctions.print_line_with_host_prefix("", host_info['name'])
-            print("Hostgroup:\t{hg}\nOS:\t\t{os}\nIP:\t\t{ip}\nResource:\t{res}\nEnv:\t\t{env}\nComment:\t{cmnt}".format(
+            output.write("Hostgroup:\t{hg}\nOS:\t\t{os}\nIP:\t\t{ip}\nResource:\t{res}\nEnv:\t\t{env}\nComment:\t{cmnt}\n".format(
                 hg=host_info['hostgroup_name'], os=host_info['operatingsystem_name'], ip=host_info['ip'],
                 cmnt=host_info['comment'], res=host_info['compute_resource_name'],
                 env=host_info['environment_name']
             ))
             if connected_hosts_names:
-                print("Cnctd hosts:\t{cnctd_hosts}".format(cnctd_hosts=' '.join(connected_hosts_names)))
+                output.write("Cnctd hosts:\t{cnctd_hosts}\n".format(cnctd_hosts=' '.join(connected_hosts_names)))
 
     def run_command(self):
         try:
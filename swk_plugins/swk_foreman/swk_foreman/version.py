@@ -1 +1 @@
-__version__ = "0.0.2a6"
+__version__ = "0.0.2a7"
@@ -9,7 +9,7 @@ setup(name='swk_zabbix',
       version=version['__version__'],
       packages=find_packages(),
       install_requires=[
-          'swk>=0.0.4a4',
+          'swk>=0.0.4a19',
           'pyzabbix>=0.7.4'
       ],
       description='Plugin for swk, enabling Zabbix api',
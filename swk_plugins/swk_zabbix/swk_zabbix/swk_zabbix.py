@@ -7,8 +7,8 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 import pyzabbix
-import sys
 import logging
 import datetime
 import re
@@ -57,7 +57,7 @@ class ZabbixPlugin(classes.SWKCommandPlugin, classes.SWKParserPlugin):
         for hostgroup in hostgroups:
             result.append(hostgroup["name"])
         for part in sorted(result):
-            sys.stdout.write(part + "\n")
+            output.write(part + "\n")
         return
 
     def _lsmntnce(self):
@@ -74,7 +74,7 @@ class ZabbixPlugin(classes.SWKCommandPlugin, classes.SWKParserPlugin):
 
             active_since = datetime.datetime.fromtimestamp(active_since_ts)
             active_till = datetime.datetime.fromtimestamp(active_till_ts)
-            sys.stdout.write('{modifier_s}{since} - {till}\t {name!s:<40}\t{hosts_groups}{modifier_k}\n'.format(
+            output.write('{modifier_s}{since} - {till}\t {name!s:<40}\t{hosts_groups}{modifier_k}\n'.format(
                 since=active_since, till=active_till, name=maintenance['name'].encode('utf-8'),
                 hosts_groups=hosts_groups,
                 modifier_s='' if active_till_ts > now_ts else '\033[1;31m',
@@ -1 +1 @@
-__version__ = "0.0.2a4"
+__version__ = "0.0.2a5"
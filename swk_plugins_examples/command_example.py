@@ -7,6 +7,7 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 
 
 class CommandPluginExample(classes.SWKCommandPlugin):
@@ -17,9 +18,9 @@ class CommandPluginExample(classes.SWKCommandPlugin):
         super(CommandPluginExample, self).__init__(*args, **kwargs)
 
     def run_command(self):
-        print("I'm running a command which requires hostlist!")
-        print("See what I got: cmd is {0}, hostlist is {1}, arguments are {2}".format(self._command, self._hostlist,
-                                                                                      self._command_args))
+        output.write("I'm running a command which requires hostlist!\n")
+        output.write("See what I got: cmd is {0}, hostlist is {1}, arguments are {2}\n".format(
+            self._command, self._hostlist, self._command_args))
 
     def run_command(self):
         self._run()
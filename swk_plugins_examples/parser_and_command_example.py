@@ -7,6 +7,7 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 
 
 class CommandAndParserPluginExample(classes.SWKCommandPlugin, classes.SWKParserPlugin):
@@ -19,8 +20,8 @@ class CommandAndParserPluginExample(classes.SWKCommandPlugin, classes.SWKParserP
         super(CommandAndParserPluginExample, self).__init__(*args, **kwargs)
 
     def run_command(self):
-        print("I'm running a command which doesn't require hostlist!")
-        print("See what I got: cmd is {0}, arguments are {1}".format(self._command, self._command_args))
+        output.write("I'm running a command which doesn't require hostlist!\n")
+        output.write("See what I got: cmd is {0}, arguments are {1}\n".format(self._command, self._command_args))
 
     def run_command(self):
         self._run()
@@ -7,6 +7,7 @@ see https://github.com/trueneu/swiss-knife for more information on License and c
 """
 
 from swk import classes
+from swk import output
 
 
 class CommandPluginExample(classes.SWKCommandPlugin):
@@ -17,8 +18,8 @@ class CommandPluginExample(classes.SWKCommandPlugin):
         super(CommandPluginExample, self).__init__(*args, **kwargs)
 
     def _run(self):
-        print("I'm running a command!")
-        print("See what I got: cmd is {0}, arguments are {1}".format(self._command, self._command_args))
+        output.write("I'm running a command!\n")
+        output.write("See what I got: cmd is {0}, arguments are {1}\n".format(self._command, self._command_args))
 
     def run_command(self):
         self._run()
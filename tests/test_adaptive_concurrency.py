@@ -0,0 +1,66 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import unittest
+
+from swk.plugins import ssh
+
+
+def result(exit_status=0, connect_time=0.01):
+    return {'exit_status': exit_status, 'dns_time': 0, 'connect_time': connect_time, 'auth_time': 0}
+
+
+class SSHAdaptiveConcurrencyTest(unittest.TestCase):
+    def _run(self, concurrency, results):
+        for host_result in results:
+            concurrency.acquire()
+            concurrency.release(host_result)
+
+    def test_slow_start(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 100)
+        self._run(concurrency, [result()] * 10)
+        self.assertEqual(concurrency.limit, 12)
+
+    def test_never_exceeds_max_limit(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 8)
+        self._run(concurrency, [result()] * 50)
+        self.assertEqual(concurrency.limit, 8)
+        self.assertEqual(concurrency.max_reached, 8)
+
+    def test_connect_failure_halves_limit(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 100)
+        self._run(concurrency, [result()] * 14)
+        self._run(concurrency, [result(exit_status=ssh.SSHAdaptiveConcurrency.connect_error_exit_code)])
+        self.assertEqual(concurrency.limit, 8)
+
+    def test_limit_is_halved_once_per_round(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 100)
+        self._run(concurrency, [result()] * 14)
+        self._run(concurrency, [result(exit_status=ssh.SSHAdaptiveConcurrency.connect_error_exit_code)] * 3)
+        self.assertEqual(concurrency.limit, 8)
+
+    def test_slow_connects_are_congestion(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 100, latency_factor=3.0)
+        self._run(concurrency, [result(connect_time=0.01)] * 14)
+        self._run(concurrency, [result(connect_time=0.1)])
+        self.assertEqual(concurrency.limit, 8)
+
+    def test_never_below_min_limit(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(4, 100)
+        for _ in range(10):
+            self._run(concurrency, [result(exit_status=ssh.SSHAdaptiveConcurrency.connect_error_exit_code)] * 10)
+        self.assertEqual(concurrency.limit, 4)
+
+    def test_pooled_connections_arent_congestion(self):
+        concurrency = ssh.SSHAdaptiveConcurrency(2, 100)
+        self._run(concurrency, [result(connect_time=0.01)] * 2 + [result(connect_time=0)] * 2)
+        self.assertEqual(concurrency.limit, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
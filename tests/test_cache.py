@@ -0,0 +1,96 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import time
+import shutil
+import tempfile
+import unittest
+
+from swk import cache
+
+
+class SWKCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._cache = cache.SWKCache(self._directory)
+        self._refreshes = 0
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _refresh(self):
+        self._refreshes += 1
+        return ['host{0}'.format(self._refreshes)]
+
+    def _age(self, key, seconds):
+        entry_path = self._cache._entry_path(key)
+        with open(entry_path) as f:
+            entry = cache.json.load(f)
+        entry['created'] -= seconds
+        with open(entry_path, 'w') as f:
+            cache.json.dump(entry, f)
+
+    def test_set_get(self):
+        self._cache.set(('p', 'h'), ['a', 'b'])
+        value, age = self._cache.get(('p', 'h'))
+        self.assertEqual(value, ['a', 'b'])
+        self.assertTrue(0 <= age < 60)
+        self.assertEqual(self._cache.get(('p', 'other')), (None, None))
+
+    def test_zero_ttl_is_not_cached(self):
+        self.assertEqual(self._cache.get_or_refresh(('p', 'h'), self._refresh, 0), ['host1'])
+        self.assertEqual(self._cache.get_or_refresh(('p', 'h'), self._refresh, 0), ['host2'])
+        self.assertEqual(self._cache.stats()['entries'], 0)
+
+    def test_fresh_hit(self):
+        self._cache.get_or_refresh(('p', 'h'), self._refresh, 300)
+        self.assertEqual(self._cache.get_or_refresh(('p', 'h'), self._refresh, 300), ['host1'])
+        self.assertEqual(self._refreshes, 1)
+
+    def test_stale_hit_refreshes_in_background(self):
+        self._cache.get_or_refresh(('p', 'h'), self._refresh, 10, 100)
+        self._age(('p', 'h'), 50)
+        self.assertEqual(self._cache.get_or_refresh(('p', 'h'), self._refresh, 10, 100), ['host1'])
+        for _ in range(100):
+            if self._cache.get(('p', 'h'))[0] == ['host2']:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self._cache.get(('p', 'h'))[0], ['host2'])
+
+    def test_expired_entry_is_refreshed(self):
+        self._cache.get_or_refresh(('p', 'h'), self._refresh, 10, 10)
+        self._age(('p', 'h'), 50)
+        self.assertEqual(self._cache.get_or_refresh(('p', 'h'), self._refresh, 10, 10), ['host2'])
+
+    def test_eviction(self):
+        small_cache = cache.SWKCache(self._directory, max_size=300)
+        for i in range(20):
+            small_cache.set(('p', str(i)), ['host'] * 5)
+        self.assertTrue(small_cache.stats()['size'] <= 300)
+
+    def test_purge(self):
+        self._cache.set(('p', 'a'), ['a'])
+        self._cache.set(('p', 'b'), ['b'])
+        self.assertEqual(self._cache.purge(), 2)
+        self.assertEqual(self._cache.stats()['entries'], 0)
+
+
+class ConfigDigestTest(unittest.TestCase):
+    def test_differs_by_config(self):
+        self.assertNotEqual(cache.config_digest({'api_url': 'a.example.com'}),
+                            cache.config_digest({'api_url': 'b.example.com'}))
+
+    def test_ignored_options(self):
+        ignored = ('hostgroup', 'cache_ttl')
+        self.assertEqual(cache.config_digest({'api_url': 'a', 'hostgroup': 'x', 'cache_ttl': '1'}, ignored),
+                         cache.config_digest({'api_url': 'a', 'hostgroup': 'y'}, ignored))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import sys
+import unittest
+from six import StringIO
+
+from swk import output
+from swk.plugins import ssh
+
+
+class SSHOutputCollatorTest(unittest.TestCase):
+    def setUp(self):
+        output.flush()
+        self._stdout, self._stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = StringIO(), StringIO()
+        self._collator = ssh.SSHOutputCollator()
+
+    def tearDown(self):
+        output.flush()
+        sys.stdout, sys.stderr = self._stdout, self._stderr
+
+    def _add(self, host, stdout, exit_status=0, stderr=""):
+        return self._collator.add({'host': host, 'exit_status': exit_status, 'stdout': stdout, 'stderr': stderr})
+
+    def test_output_is_taken_out_of_results(self):
+        self.assertEqual(self._add('web1', "ok\n"), {'host': 'web1', 'exit_status': 0})
+
+    def test_identical_outputs_are_grouped(self):
+        for host in ('web1', 'web2', 'web3'):
+            self._add(host, "ok\n")
+        self._add('web4', "failed\n", exit_status=1)
+        self._collator.print_collated()
+        output.flush()
+        lines = sys.stdout.getvalue().splitlines()
+        self.assertEqual(lines[1], "web[1-3] (3 hosts)")
+        self.assertEqual(lines[3], "ok")
+        self.assertEqual(lines[5], "web4 (1 host, exit status 1)")
+        self.assertEqual(lines[7], "failed")
+
+    def test_exit_status_tells_outputs_apart(self):
+        self._add('web1', "ok\n")
+        self._add('web2', "ok\n", exit_status=2)
+        self._collator.print_collated()
+        output.flush()
+        self.assertEqual(sys.stdout.getvalue().count("ok\n"), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import io
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from swk.plugins import ssh
+
+
+class GatherMemberPathTest(unittest.TestCase):
+    def test_paths(self):
+        self.assertEqual(ssh.gather_member_path('tmp/dir/file'), 'tmp/dir/file')
+        self.assertEqual(ssh.gather_member_path('./dir//file'), 'dir/file')
+        self.assertEqual(ssh.gather_member_path('/etc/passwd'), 'etc/passwd')
+        self.assertEqual(ssh.gather_member_path('dir/../../file'), None)
+        self.assertEqual(ssh.gather_member_path('.'), None)
+
+
+class SSHGatherArchiveTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._archive_path = os.path.join(self._directory, 'gathered.tar.gz')
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    @staticmethod
+    def _tarinfo(name, size):
+        tarinfo = tarfile.TarInfo(name)
+        tarinfo.size = size
+        return tarinfo
+
+    def test_members_are_prefixed_with_host(self):
+        archive = ssh.SSHGatherArchive(self._archive_path, 'gz')
+        archive.put_member('host1', 'dir/file', self._tarinfo('dir/file', 4), io.BytesIO(b'data'))
+        archive.close()
+        with tarfile.open(self._archive_path) as result:
+            self.assertEqual(result.getnames(), ['host1/dir/file'])
+            self.assertEqual(result.extractfile('host1/dir/file').read(), b'data')
+
+    def test_cut_short_member_isnt_written(self):
+        archive = ssh.SSHGatherArchive(self._archive_path, 'gz')
+        self.assertRaises(IOError, archive.put_member, 'host1', 'file', self._tarinfo('file', 100),
+                          io.BytesIO(b'short'))
+        archive.put_member('host2', 'file', self._tarinfo('file', 4), io.BytesIO(b'data'))
+        archive.close()
+        with tarfile.open(self._archive_path) as result:
+            self.assertEqual(result.getnames(), ['host2/file'])
+
+
+if __name__ == '__main__':
+    unittest.main()
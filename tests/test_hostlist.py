@@ -0,0 +1,83 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import unittest
+
+from swk import hostlist
+
+
+class HostListTest(unittest.TestCase):
+    def test_keeps_insertion_order(self):
+        hosts = hostlist.HostList(['c', 'a', 'b', 'a'])
+        self.assertEqual(list(hosts), ['c', 'a', 'b'])
+        self.assertEqual(hosts.sorted(), ['a', 'b', 'c'])
+
+    def test_operations(self):
+        hosts = hostlist.HostList(['a', 'b', 'c'])
+        self.assertEqual(list(hosts | ['d', 'a']), ['a', 'b', 'c', 'd'])
+        self.assertEqual(list(hosts - ['b', 'x']), ['a', 'c'])
+        self.assertEqual(list(hosts & ['c', 'a', 'x']), ['a', 'c'])
+        self.assertTrue('a' in hosts)
+        self.assertEqual(len(hosts), 3)
+
+
+class HostRangeTest(unittest.TestCase):
+    def _expand(self, pattern, ranges=True):
+        host_range = hostlist.HostRange.parse(pattern, ranges=ranges)
+        return None if host_range is None else list(host_range)
+
+    def test_numeric_ranges(self):
+        self.assertEqual(self._expand('web[1-3,7,10-12]'), ['web1', 'web2', 'web3', 'web7', 'web10', 'web11', 'web12'])
+        self.assertEqual(self._expand('web[008-011].dc1'), ['web008.dc1', 'web009.dc1', 'web010.dc1', 'web011.dc1'])
+
+    def test_alternatives(self):
+        self.assertEqual(self._expand('db{a,b}[1-2]'), ['dba1', 'dba2', 'dbb1', 'dbb2'])
+
+    def test_character_classes(self):
+        self.assertEqual(self._expand('host[a-c]'), ['hosta', 'hostb', 'hostc'])
+        self.assertEqual(self._expand('host[1123]', ranges=False), ['host1', 'host2', 'host3'])
+
+    def test_regex_semantics_without_ranges(self):
+        self.assertEqual(self._expand('web[10-2]', ranges=False), ['web1', 'web0', 'web2'])
+        self.assertEqual(self._expand('web[1-3,7]', ranges=False), None)
+        self.assertEqual(self._expand('db{a,b}', ranges=False), None)
+
+    def test_regex_is_left_to_exrex(self):
+        self.assertEqual(self._expand('web(1|2)'), None)
+        self.assertEqual(self._expand('web[0-9]{2}'), None)
+
+    def test_invalid_range(self):
+        self.assertRaises(ValueError, hostlist.HostRange.parse, 'web[10-5]', True)
+        self.assertRaises(ValueError, hostlist.HostRange.parse, 'web[c-a]')
+
+    def test_count(self):
+        self.assertEqual(hostlist.HostRange.parse('web[001-500]', ranges=True).count(), 500)
+        overlapping = hostlist.HostRange.parse('x[1-3,2-3]', ranges=True)
+        self.assertEqual(overlapping.count(), 3)
+        self.assertEqual(list(overlapping), ['x1', 'x2', 'x3'])
+
+
+class CompactTest(unittest.TestCase):
+    def test_ranges(self):
+        self.assertEqual(hostlist.compact(['web1', 'web2', 'web3', 'web7', 'db1']), 'db1 web[1-3,7]')
+
+    def test_zero_padded(self):
+        self.assertEqual(hostlist.compact(['web001', 'web002', 'web010']), 'web[001-002,010]')
+        self.assertEqual(hostlist.compact(['web09', 'web10']), 'web[09-10]')
+        self.assertEqual(hostlist.compact(['web9', 'web10']), 'web[9-10]')
+
+    def test_hosts_without_numbers(self):
+        self.assertEqual(hostlist.compact(['b', 'a', 'a']), 'a b')
+
+    def test_round_trip(self):
+        hosts = ['web{0:03d}.example.com'.format(x) for x in list(range(1, 20)) + [42, 100]]
+        self.assertEqual(sorted(hostlist.HostRange.parse(hostlist.compact(hosts), ranges=True)), sorted(hosts))
+
+
+if __name__ == '__main__':
+    unittest.main()
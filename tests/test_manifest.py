@@ -0,0 +1,100 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from swk import classes
+from swk import exceptions
+from swk import manifest
+
+
+class ManifestExamplePlugin(classes.SWKCommandPlugin, classes.SWKParserPlugin):
+    _commands = {'example': {'requires_hostlist': True, 'help': 'Example command\n'}}
+    _commands_help_message = "example - do nothing\n"
+    _parsers = {'%': {'help': 'Example parser\n'}}
+    _parsers_help_message = "%example\n"
+
+
+plugin_module_source = '''
+from swk import classes
+
+
+class LazyExamplePlugin(classes.SWKCommandPlugin):
+    _commands = {'lazy': {'requires_hostlist': False, 'help': 'Lazy command\\n'}}
+    _commands_help_message = "lazy - do nothing\\n"
+'''
+
+
+class SWKPluginsManifestTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        self._manifest = manifest.SWKPluginsManifest(self._directory)
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def test_make_record(self):
+        record = manifest.SWKPluginsManifest.make_record('module', None, 'ManifestExamplePlugin',
+                                                         ManifestExamplePlugin)
+        self.assertTrue(record['is_command_plugin'])
+        self.assertTrue(record['is_parser_plugin'])
+        self.assertEqual(record['commands']['example'], {'help': 'Example command\n', 'requires_hostlist': True,
+                                                         'streams_hostlist': False})
+        self.assertEqual(record['parsers']['%'], {'help': 'Example parser\n'})
+
+    def test_load_checks_signature(self):
+        self.assertEqual(self._manifest.load(['sig']), None)
+        self._manifest.save(['sig'], [{'class': 'A'}], [])
+        self.assertEqual(self._manifest.load(['sig']), [{'class': 'A'}])
+        self.assertEqual(self._manifest.load(['other sig']), None)
+
+    def test_failed_modules_make_manifest_stale(self):
+        self._manifest.save(['sig'], [{'class': 'A'}], ['broken_module'])
+        self.assertEqual(self._manifest.load(['sig']), None)
+
+    def test_invalidate(self):
+        self._manifest.save(['sig'], [], [])
+        self._manifest.invalidate()
+        self.assertEqual(self._manifest.load(['sig']), None)
+
+
+class SWKLazyPluginTest(unittest.TestCase):
+    def setUp(self):
+        self._directory = tempfile.mkdtemp()
+        with open(os.path.join(self._directory, 'swk_lazy_example.py'), 'w') as f:
+            f.write(plugin_module_source)
+
+    def tearDown(self):
+        shutil.rmtree(self._directory)
+
+    def _record(self, class_name='LazyExamplePlugin'):
+        return {'module': 'swk_lazy_example', 'path': self._directory, 'class': class_name,
+                'commands': {'lazy': {'help': 'Lazy command\n', 'requires_hostlist': False}},
+                'parsers': dict(), 'commands_help': "lazy - do nothing\n", 'parsers_help': ""}
+
+    def test_answers_from_record(self):
+        plugin = manifest.SWKLazyPlugin(self._record())
+        self.assertEqual(list(plugin.get_commands()), ['lazy'])
+        self.assertFalse(plugin.requires_hostlist('lazy'))
+        self.assertFalse(plugin.streams_hostlist('lazy'))
+        self.assertEqual(plugin.commands_help(), "lazy - do nothing\n")
+
+    def test_load(self):
+        plugin_class = manifest.SWKLazyPlugin(self._record()).load()
+        self.assertEqual(plugin_class.__name__, 'LazyExamplePlugin')
+
+    def test_load_missing_class(self):
+        plugin = manifest.SWKLazyPlugin(self._record('NoSuchPlugin'))
+        self.assertRaises(exceptions.PluginImportError, plugin.load)
+
+
+if __name__ == '__main__':
+    unittest.main()
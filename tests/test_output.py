@@ -0,0 +1,62 @@
+"""
+swk - A tiny extendable utility for running commands against multiple hosts.
+
+Copyright (C) 2016  Pavel "trueneu" Gurkov
+
+see swk/main.py for more information on License and contacts
+"""
+
+import sys
+import threading
+import unittest
+from six import StringIO
+
+from swk import output
+
+
+class SWKOutputWriterTest(unittest.TestCase):
+    def setUp(self):
+        self._stdout, self._stderr = sys.stdout, sys.stderr
+        sys.stdout, sys.stderr = StringIO(), StringIO()
+        self._writer = output.SWKOutputWriter()
+
+    def tearDown(self):
+        self._writer.flush()
+        sys.stdout, sys.stderr = self._stdout, self._stderr
+
+    def test_flush_writes_everything(self):
+        for i in range(1000):
+            self._writer.write("line {0}\n".format(i))
+        self._writer.flush()
+        self.assertEqual(sys.stdout.getvalue(), "".join("line {0}\n".format(i) for i in range(1000)))
+
+    def test_streams(self):
+        self._writer.write("out\n")
+        self._writer.write("err\n", is_err=True)
+        self._writer.flush()
+        self.assertEqual(sys.stdout.getvalue(), "out\n")
+        self.assertEqual(sys.stderr.getvalue(), "err\n")
+
+    def test_pieces_from_threads_dont_mix(self):
+        def _write(host):
+            for i in range(200):
+                self._writer.write("[{0}]: a{1}\n[{0}]: b{1}\n".format(host, i))
+
+        threads = [threading.Thread(target=_write, args=(host,)) for host in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self._writer.flush()
+
+        lines = sys.stdout.getvalue().splitlines()
+        self.assertEqual(len(lines), 8 * 200 * 2)
+        for first, second in zip(lines[::2], lines[1::2]):
+            self.assertEqual(first.replace(': a', ': b'), second)
+        for host in range(8):
+            host_lines = [line for line in lines if line.startswith("[{0}]".format(host))]
+            self.assertEqual(host_lines, ["[{0}]: {1}{2}".format(host, x, i) for i in range(200) for x in 'ab'])
+
+
+if __name__ == '__main__':
+    unittest.main()